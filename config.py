@@ -1,4 +1,5 @@
 import os
+from typing import NamedTuple
 
 # Window/game title
 GAME_WINDOW_TITLE = 'Raid: Shadow Legends'
@@ -24,6 +25,7 @@ TEMPLATE_BACK = os.path.join(TEMPLATES_DIR, 'Back.png')
 # Other constants
 MIN_SELECTION_SIZE = 10
 CLICK_DELAY = 2.0  # seconds between clicks
+LOG_MAX_LINES = 2000  # lines kept in the GUI log before the oldest are dropped
 
 # =============================================================================
 # Classic Arena Settings
@@ -39,34 +41,74 @@ ARENA_POST_BATTLE_DELAY = 2.0   # Delay after battle completes
 ARENA_SCROLL_DURATION = 0.5     # Duration of scroll drag animation
 ARENA_MAX_SCROLL_ATTEMPTS = 6   # Max scroll attempts to find all opponents
 
+class OCRRegion(NamedTuple):
+    """Rectangle as percentages of window dimensions"""
+    x_start: float
+    y_start: float
+    width: float
+    height: float
+
+
+class ListRegion(NamedTuple):
+    """Vertical scroll band as percentages of window dimensions"""
+    x_center: float
+    y_start: float
+    y_end: float
+
+
+# Where fixed UI buttons appear (percentages of window dimensions)
+# TemplateMatcher searches here first and only scans the whole window on a miss
+TEMPLATE_SEARCH_ROIS = {
+    TEMPLATE_BACK: OCRRegion(x_start=0.0, y_start=0.0, width=0.2, height=0.15),     # Top-left corner
+    TEMPLATE_BATTLE: OCRRegion(x_start=0.7, y_start=0.8, width=0.3, height=0.2),    # Bottom-right corner
+}
+
+
 # OCR Region (percentages of window dimensions)
 # These define where to look for Team Power text
 # FULL region used for initial scan - covers all 4 visible opponents
-ARENA_OCR_REGION = {
-    'x_start': 0.65,    # Start X - where "Team Power:" text appears
-    'y_start': 0.24,    # Start Y - slightly above first opponent to catch all text
-    'width': 0.25,      # Width - just the Team Power text area
-    'height': 0.74,     # Height - extend fully to bottom (ends at 98%)
-}
+ARENA_OCR_REGION = OCRRegion(
+    x_start=0.65,       # Start X - where "Team Power:" text appears
+    y_start=0.24,       # Start Y - slightly above first opponent to catch all text
+    width=0.25,         # Width - just the Team Power text area
+    height=0.74,        # Height - extend fully to bottom (ends at 98%)
+)
 
 # BOTTOM BAND - used after scrolling to only capture newly revealed opponents
 # Only scans the bottom opponent slot - bottom edge aligns with FULL region
-ARENA_OCR_BOTTOM_BAND = {
-    'x_start': 0.65,    # Same X as main region
-    'y_start': 0.82,    # Start at 4th opponent position
-    'width': 0.25,      # Same width
-    'height': 0.16,     # Extend to bottom (~98%, same as FULL)
-}
+ARENA_OCR_BOTTOM_BAND = OCRRegion(
+    x_start=0.65,       # Same X as main region
+    y_start=0.82,       # Start at 4th opponent position
+    width=0.25,         # Same width
+    height=0.16,        # Extend to bottom (~98%, same as FULL)
+)
+
+# Height of the first opponent row within ARENA_OCR_REGION (% of window height)
+ARENA_OCR_FIRST_ROW_HEIGHT = 0.25
+
+# Blank everything but near-white pixels before OCR in the opponent scan
+# (off until validated against real screenshots - colored text would be lost)
+ARENA_OCR_TEXT_MASK = False
+ARENA_OCR_TEXT_HSV_LOW = (0, 0, 180)       # Any hue, low saturation, bright
+ARENA_OCR_TEXT_HSV_HIGH = (179, 40, 255)
+
+# Scale applied to the opponent OCR region before Tesseract (0.5 = a quarter of the pixels)
+# Keep at 1.0 unless the Team Power digits stay well above ~20 px tall after scaling
+ARENA_OCR_SCALE = 1.0
 
 # Battle button region (approximate X position as % of window width)
 ARENA_BATTLE_BUTTON_X = 0.90
 
+# Rows sampled for the orange/gray Battle button check, relative to the Team Power text Y (pixels)
+ARENA_AVAILABILITY_ROWS_ABOVE = 80
+ARENA_AVAILABILITY_ROWS_BELOW = 20
+
 # Opponent list region (for scrolling)
-ARENA_LIST_REGION = {
-    'x_center': 0.50,   # Center X for scroll drag
-    'y_start': 0.50,    # Top of list area (scroll destination)
-    'y_end': 0.68,      # Bottom of list area (scroll start) - 16% = ~1.6 opponent heights
-}
+ARENA_LIST_REGION = ListRegion(
+    x_center=0.50,      # Center X for scroll drag
+    y_start=0.50,       # Top of list area (scroll destination)
+    y_end=0.68,         # Bottom of list area (scroll start) - 16% = ~1.6 opponent heights
+)
 
 # Maximum battles per session (matches "Battles: X/20" limit)
 ARENA_MAX_BATTLES = 20
@@ -2,11 +2,15 @@
 Debug Overlay - Transparent window that shows scan regions over the game
 """
 
+import heapq
+import itertools
 import sys
 import time
+from functools import lru_cache
+from types import MappingProxyType
 from PyQt5.QtWidgets import QWidget, QApplication
-from PyQt5.QtCore import Qt, QRect, QTimer
-from PyQt5.QtGui import QPainter, QPen, QColor, QFont, QBrush
+from PyQt5.QtCore import Qt, QRect, QTimer, QLineF
+from PyQt5.QtGui import QPainter, QPainterPath, QPen, QColor, QFont, QBrush, QRegion, QPixmap, QFontMetrics
 
 # Windows-specific imports for true click-through
 if sys.platform == 'win32':
@@ -25,24 +29,67 @@ if sys.platform == 'win32':
     user32.GetWindowLongW.restype = ctypes.c_long
 
 
+@lru_cache(maxsize=8)
+def _resolve_region(width, height, x_start, y_start, w_pct, h_pct):
+    """
+    Convert a percentage-based region config to pixel (x, y, w, h).
+    Cached since the game window is kept at a fixed size.
+    """
+    return (int(width * x_start), int(height * y_start),
+            int(width * w_pct), int(height * h_pct))
+
+
+# Extra pixels around a rect to repaint (covers thick outline pen)
+DIRTY_RECT_PADDING = 5
+
+
+def _region_pixels(width, height, region_config):
+    """Resolve an OCRRegion config to pixels for the given window size"""
+    return _resolve_region(width, height,
+                           region_config.x_start, region_config.y_start,
+                           region_config.width, region_config.height)
+
+
 class DebugOverlay(QWidget):
     """
     Transparent overlay window that displays scan regions over the game.
     Click-through so it doesn't interfere with gameplay.
     """
     
+    # Region outline colors (semi-transparent), built once at import
+    COLORS = MappingProxyType({
+        'red': QColor(255, 0, 0, 180),
+        'green': QColor(0, 255, 0, 180),
+        'blue': QColor(0, 100, 255, 180),
+        'yellow': QColor(255, 255, 0, 180),
+        'orange': QColor(255, 165, 0, 180),
+        'purple': QColor(128, 0, 128, 180),
+    })
+    DEFAULT_COLOR = COLORS['red']
+    FLASH_COLOR = QColor(0, 255, 0, 120)  # Semi-transparent green
+    
     def __init__(self):
         super().__init__()
         
         # Store regions to draw: list of (rect, color, label)
         self.regions = []
         
-        # Store detection flashes: list of {rect, color, label, expire_time}
+        # Regions rendered once into a transparent pixmap, rebuilt when regions change
+        self._static_pixmap = None
+        self._static_size = None
+        
+        # Store detection flashes: min-heap of (expire_time_ns, seq, {rect, color, label})
+        # expire_time_ns is on the time.monotonic_ns() clock (immune to wall clock jumps)
+        # seq breaks ties so flash dicts are never compared
         self.detection_flashes = []
+        self._flash_seq = itertools.count()
         
         # Window position/size (will be set to match game window)
         self.game_rect = None
         
+        # Flash bar geometry (x, width, height), derived from game window width
+        self._flash_geometry = None
+        
         # Setup transparent, click-through, always-on-top window
         self.setWindowFlags(
             Qt.WindowStaysOnTopHint |  # Always on top
@@ -52,18 +99,44 @@ class DebugOverlay(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)  # Transparent background
         self.setAttribute(Qt.WA_TransparentForMouseEvents)  # Click-through (Qt level)
         
-        # Don't show until positioned
-        self.hide()
-        
         # Auto-refresh timer (for flash expiration)
+        # Started by flash_detection, stopped once no flashes remain or the overlay hides
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self._on_refresh)
-        self.refresh_timer.start(100)  # Check every 100ms
+        
+        # Don't show until positioned
+        self.hide()
+        
+        # Coalesced repaint state: queued flag + accumulated dirty area
+        self._update_pending = False
+        self._pending_full = False
+        self._pending_region = QRegion()
+        
+        # Flash batching: flashes added between begin_batch/end_batch share one repaint
+        self._batching = False
+        self._batch_pending = False
+        
+        # Font and flash pens (built once, reused every paint)
+        self._label_font = QFont('Arial', 12, QFont.Bold)
+        self._label_metrics = QFontMetrics(self._label_font)
+        self._flash_border_pen = QPen(QColor(0, 255, 0, 255))  # Solid green border
+        self._flash_border_pen.setWidth(2)
+        self._text_outline_pen = QPen(QColor(0, 0, 0, 255), 2)
+        self._text_brush = QBrush(QColor(255, 255, 255, 255))
+        self._label_bg_color = QColor(0, 0, 0, 150)
     
     def showEvent(self, event):
         """Apply Windows-specific click-through when window is shown"""
         super().showEvent(event)
         self._make_click_through()
+        if self.detection_flashes:
+            # Resume expiring flashes that were pending when the overlay was hidden
+            self._ensure_refresh_timer()
+    
+    def hideEvent(self, event):
+        """Stop the refresh timer so a hidden overlay doesn't wake the event loop"""
+        super().hideEvent(event)
+        self.refresh_timer.stop()
     
     def _make_click_through(self):
         """Use Windows API to make window truly click-through"""
@@ -75,21 +148,86 @@ class DebugOverlay(QWidget):
             user32.SetWindowLongW(hwnd, GWL_EXSTYLE, ex_style | WS_EX_LAYERED | WS_EX_TRANSPARENT)
     
     def _on_refresh(self):
-        """Timer callback to expire old flashes"""
-        now = time.time()
-        # Remove expired flashes
-        self.detection_flashes = [f for f in self.detection_flashes if f['expire_time'] > now]
-        self.update()
+        """Timer callback to expire old flashes (stops the timer once none are left)"""
+        if not self.detection_flashes or not self.isVisible():
+            self.refresh_timer.stop()
+            return
+        now = time.monotonic_ns()
+        # Pop expired flashes off the heap, repaint only if something went away
+        if self.detection_flashes[0][0] > now:
+            return
+        expired_area = QRegion()
+        while self.detection_flashes and self.detection_flashes[0][0] <= now:
+            _, _, flash = heapq.heappop(self.detection_flashes)
+            expired_area = expired_area.united(self._dirty_rect(flash['rect']))
+        if not self.detection_flashes:
+            self.refresh_timer.stop()
+        self.update(expired_area)
+    
+    @staticmethod
+    def _dirty_rect(rect):
+        """Area to repaint for a region/flash rect"""
+        return rect.adjusted(-DIRTY_RECT_PADDING, -DIRTY_RECT_PADDING,
+                             DIRTY_RECT_PADDING, DIRTY_RECT_PADDING)
+    
+    def _schedule_update(self, rect=None):
+        """
+        Queue a single repaint on the next event loop tick (bursty calls collapse to one).
+        Pass rect to repaint only that area, None for the whole overlay.
+        """
+        self._mark_dirty(rect)
+        self._queue_update()
+    
+    def _mark_dirty(self, rect=None):
+        """Add rect (or the whole overlay if None) to the pending repaint area"""
+        if rect is None:
+            self._pending_full = True
+        else:
+            self._pending_region = self._pending_region.united(self._dirty_rect(rect))
+    
+    def _queue_update(self):
+        """Post the pending repaint to the event loop once"""
+        if not self._update_pending:
+            self._update_pending = True
+            QTimer.singleShot(0, self._flush_update)
+    
+    def _flush_update(self):
+        """Run the queued repaint"""
+        if self._pending_full:
+            self.update()
+        else:
+            self.update(self._pending_region)
+        self._update_pending = False
+        self._pending_full = False
+        self._pending_region = QRegion()
+    
+    def _ensure_refresh_timer(self):
+        """Restart the flash-expiry timer if it was stopped while idle"""
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start(100)
         
     def set_game_window(self, left, top, width, height):
         """Position overlay to match game window"""
+        if self.game_rect is None or self.game_rect.width() != width:
+            # Flash spans the Team Power text area
+            self._flash_geometry = (
+                int(width * 0.65),  # Match OCR region x_start
+                int(width * 0.25),  # Match OCR region width
+                35,                 # Height of one opponent row approximately
+            )
         self.game_rect = QRect(left, top, width, height)
         self.setGeometry(left, top, width, height)
         
     def clear_regions(self):
         """Clear all regions"""
+        if not self.regions:
+            return
+        cleared_area = QRegion()
+        for region in self.regions:
+            cleared_area = cleared_area.united(self._dirty_rect(region['rect']))
         self.regions = []
-        self.update()
+        self._static_pixmap = None
+        self.update(cleared_area)
         
     def add_region(self, x, y, width, height, color='red', label=''):
         """
@@ -101,22 +239,50 @@ class DebugOverlay(QWidget):
             color: 'red', 'green', 'blue', 'yellow', or hex string
             label: Optional text label
         """
-        color_map = {
-            'red': QColor(255, 0, 0, 180),
-            'green': QColor(0, 255, 0, 180),
-            'blue': QColor(0, 100, 255, 180),
-            'yellow': QColor(255, 255, 0, 180),
-            'orange': QColor(255, 165, 0, 180),
-            'purple': QColor(128, 0, 128, 180),
-        }
+        qcolor = self.COLORS.get(color, self.DEFAULT_COLOR)
+        rect = QRect(x, y, width, height)
+        
+        # Thick outline pen and thin label pen, built once per region
+        pen = QPen(qcolor)
+        pen.setWidth(3)
         
-        qcolor = color_map.get(color, QColor(255, 0, 0, 180))
+        # Label background, measured once (labels never change after insertion)
+        text_rect = None
+        if label:
+            text_rect = self._label_metrics.boundingRect(label)
+            text_rect.moveTo(x + 5, y + 5)
+            text_rect.adjust(-3, -2, 6, 4)
+        
+        self._static_pixmap = None
         self.regions.append({
-            'rect': QRect(x, y, width, height),
+            'rect': rect,
             'color': qcolor,
-            'label': label
+            'label': label,
+            'text_rect': text_rect,
+            'pen': pen,
+            'label_pen': QPen(qcolor),
+            'corner_lines': self._corner_lines(rect),
         })
-        self.update()
+        self._schedule_update(rect)
+    
+    @staticmethod
+    def _corner_lines(rect, corner_size=15):
+        """Build the 8 corner marker segments for a region rect"""
+        left, top, right, bottom = rect.left(), rect.top(), rect.right(), rect.bottom()
+        return [
+            # Top-left
+            QLineF(left, top, left + corner_size, top),
+            QLineF(left, top, left, top + corner_size),
+            # Top-right
+            QLineF(right, top, right - corner_size, top),
+            QLineF(right, top, right, top + corner_size),
+            # Bottom-left
+            QLineF(left, bottom, left + corner_size, bottom),
+            QLineF(left, bottom, left, bottom - corner_size),
+            # Bottom-right
+            QLineF(right, bottom, right - corner_size, bottom),
+            QLineF(right, bottom, right, bottom - corner_size),
+        ]
     
     def flash_detection(self, x, y, width, height, power_value, duration=1.0):
         """
@@ -131,13 +297,30 @@ class DebugOverlay(QWidget):
         """
         flash = {
             'rect': QRect(x, y, width, height),
-            'color': QColor(0, 255, 0, 120),  # Semi-transparent green
+            'color': self.FLASH_COLOR,
             'label': f'FOUND: {power_value:,}',
-            'expire_time': time.time() + duration
         }
-        self.detection_flashes.append(flash)
+        expire_time_ns = time.monotonic_ns() + int(duration * 1e9)
+        heapq.heappush(self.detection_flashes, (expire_time_ns, next(self._flash_seq), flash))
+        self._ensure_refresh_timer()
+        if self._batching:
+            self._batch_pending = True
+            self._mark_dirty(flash['rect'])
+            return
         self.show()
-        self.update()
+        self._schedule_update(flash['rect'])
+    
+    def begin_batch(self):
+        """Start collecting flashes without repainting (e.g. all powers from one scan frame)"""
+        self._batching = True
+    
+    def end_batch(self):
+        """Stop collecting flashes and show everything added since begin_batch in one repaint"""
+        self._batching = False
+        if self._batch_pending:
+            self._batch_pending = False
+            self.show()
+            self._queue_update()
     
     def flash_detection_at_y(self, y_position, power_value, duration=1.0):
         """
@@ -151,46 +334,38 @@ class DebugOverlay(QWidget):
         if not self.game_rect:
             return
         
-        # Flash spans the Team Power text area
-        width = self.game_rect.width()
-        flash_x = int(width * 0.65)  # Match OCR region x_start
-        flash_width = int(width * 0.25)  # Match OCR region width
-        flash_height = 35  # Height of one opponent row approximately
+        flash_x, flash_width, flash_height = self._flash_geometry
         
         # Center the flash on the Y position
         flash_y = y_position - flash_height // 2
         
         self.flash_detection(flash_x, flash_y, flash_width, flash_height, power_value, duration)
     
-    def show_full_scan_region(self, window_info, full_region_config):
-        """Show only the FULL SCAN region (red) - used during initial scan"""
+    def _render_region_set(self, window_info, items):
+        """
+        Replace the displayed regions with a new set and show the overlay
+        
+        Args:
+            window_info: (left, top, width, height) of game window
+            items: List of (region_config, color, label) tuples
+        """
         left, top, width, height = window_info
         self.set_game_window(left, top, width, height)
         self.clear_regions()
         
-        x = int(width * full_region_config['x_start'])
-        y = int(height * full_region_config['y_start'])
-        w = int(width * full_region_config['width'])
-        h = int(height * full_region_config['height'])
-        self.add_region(x, y, w, h, 'red', 'FULL SCAN')
+        for region_config, color, label in items:
+            x, y, w, h = _region_pixels(width, height, region_config)
+            self.add_region(x, y, w, h, color, label)
         
         self.show()
-        self.update()
+    
+    def show_full_scan_region(self, window_info, full_region_config):
+        """Show only the FULL SCAN region (red) - used during initial scan"""
+        self._render_region_set(window_info, [(full_region_config, 'red', 'FULL SCAN')])
     
     def show_bottom_band_region(self, window_info, bottom_band_config):
         """Show only the BOTTOM BAND region (yellow) - used after scrolling"""
-        left, top, width, height = window_info
-        self.set_game_window(left, top, width, height)
-        self.clear_regions()
-        
-        x = int(width * bottom_band_config['x_start'])
-        y = int(height * bottom_band_config['y_start'])
-        w = int(width * bottom_band_config['width'])
-        h = int(height * bottom_band_config['height'])
-        self.add_region(x, y, w, h, 'yellow', 'BOTTOM BAND')
-        
-        self.show()
-        self.update()
+        self._render_region_set(window_info, [(bottom_band_config, 'yellow', 'BOTTOM BAND')])
         
     def show_ocr_regions(self, window_info, full_region_config, bottom_band_config=None):
         """
@@ -198,122 +373,106 @@ class DebugOverlay(QWidget):
         
         Args:
             window_info: (left, top, width, height) of game window
-            full_region_config: Dict with x_start, y_start, width, height (as percentages)
-            bottom_band_config: Optional dict for bottom band region
+            full_region_config: OCRRegion with x_start, y_start, width, height (as percentages)
+            bottom_band_config: Optional OCRRegion for bottom band
         """
-        left, top, width, height = window_info
-        self.set_game_window(left, top, width, height)
-        self.clear_regions()
-        
+        items = []
         # Full OCR region (red)
         if full_region_config:
-            x = int(width * full_region_config['x_start'])
-            y = int(height * full_region_config['y_start'])
-            w = int(width * full_region_config['width'])
-            h = int(height * full_region_config['height'])
-            self.add_region(x, y, w, h, 'red', 'FULL SCAN')
-        
+            items.append((full_region_config, 'red', 'FULL SCAN'))
         # Bottom band (yellow)
         if bottom_band_config:
-            x = int(width * bottom_band_config['x_start'])
-            y = int(height * bottom_band_config['y_start'])
-            w = int(width * bottom_band_config['width'])
-            h = int(height * bottom_band_config['height'])
-            self.add_region(x, y, w, h, 'yellow', 'BOTTOM BAND')
-        
-        self.show()
-        self.update()
+            items.append((bottom_band_config, 'yellow', 'BOTTOM BAND'))
+        self._render_region_set(window_info, items)
         
     def show_single_region(self, window_info, region_config, color='red', label=''):
         """Show just one region"""
-        left, top, width, height = window_info
-        self.set_game_window(left, top, width, height)
-        self.clear_regions()
+        self._render_region_set(window_info, [(region_config, color, label)])
         
-        x = int(width * region_config['x_start'])
-        y = int(height * region_config['y_start'])
-        w = int(width * region_config['width'])
-        h = int(height * region_config['height'])
-        self.add_region(x, y, w, h, color, label)
+    def _render_static_layer(self):
+        """Paint all scan regions into a cached transparent pixmap"""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
         
-        self.show()
-        self.update()
+        # Everything here is axis-aligned, so only text needs antialiasing
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(self._label_font)
         
-    def paintEvent(self, event):
-        """Draw the regions and detection flashes"""
-        if not self.regions and not self.detection_flashes:
-            return
-            
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Setup font for labels
-        font = QFont('Arial', 12, QFont.Bold)
-        painter.setFont(font)
-        
-        # Draw static regions (scan areas)
         for region in self.regions:
             rect = region['rect']
-            color = region['color']
             label = region['label']
             
-            # Draw rectangle outline (thick)
-            pen = QPen(color)
-            pen.setWidth(3)
-            painter.setPen(pen)
+            # Draw rectangle outline (thick) and corner markers for visibility
+            painter.setPen(region['pen'])
             painter.drawRect(rect)
-            
-            # Draw corner markers for visibility
-            corner_size = 15
-            # Top-left
-            painter.drawLine(rect.left(), rect.top(), rect.left() + corner_size, rect.top())
-            painter.drawLine(rect.left(), rect.top(), rect.left(), rect.top() + corner_size)
-            # Top-right
-            painter.drawLine(rect.right(), rect.top(), rect.right() - corner_size, rect.top())
-            painter.drawLine(rect.right(), rect.top(), rect.right(), rect.top() + corner_size)
-            # Bottom-left
-            painter.drawLine(rect.left(), rect.bottom(), rect.left() + corner_size, rect.bottom())
-            painter.drawLine(rect.left(), rect.bottom(), rect.left(), rect.bottom() - corner_size)
-            # Bottom-right
-            painter.drawLine(rect.right(), rect.bottom(), rect.right() - corner_size, rect.bottom())
-            painter.drawLine(rect.right(), rect.bottom(), rect.right(), rect.bottom() - corner_size)
+            painter.drawLines(region['corner_lines'])
             
             # Draw label with background
             if label:
-                text_rect = painter.fontMetrics().boundingRect(label)
-                text_rect.moveTo(rect.left() + 5, rect.top() + 5)
-                text_rect.adjust(-3, -2, 6, 4)
-                
-                painter.fillRect(text_rect, QColor(0, 0, 0, 150))
-                painter.setPen(QPen(color))
+                painter.fillRect(region['text_rect'], self._label_bg_color)
+                painter.setPen(region['label_pen'])
                 painter.drawText(rect.left() + 5, rect.top() + 20, label)
         
+        painter.end()
+        self._static_pixmap = pixmap
+        self._static_size = self.size()
+    
+    def paintEvent(self, event):
+        """Draw the regions and detection flashes"""
+        if not self.regions and not self.detection_flashes:
+            return
+        # Nothing to see while the game window is empty (minimized) or entirely off screen
+        if self.game_rect is None or self.game_rect.isEmpty():
+            return
+        screen = QApplication.primaryScreen()
+        if screen is not None and not screen.virtualGeometry().intersects(self.game_rect):
+            return
+        
+        # Static regions (scan areas) come from the cached layer
+        if self.regions:
+            if self._static_pixmap is None or self._static_size != self.size():
+                self._render_static_layer()
+        
+        # Rects are axis-aligned; antialiasing is enabled only for label paths below
+        painter = QPainter(self)
+        
+        if self.regions:
+            painter.drawPixmap(0, 0, self._static_pixmap)
+        
+        # Only the dirty area needs redrawing
+        dirty = event.region()
+        
         # Draw detection flashes (filled rectangles)
-        for flash in self.detection_flashes:
+        for _, _, flash in self.detection_flashes:
             rect = flash['rect']
             color = flash['color']
             label = flash['label']
+            if not dirty.intersects(self._dirty_rect(rect)):
+                continue
             
             # Draw filled semi-transparent rectangle
             painter.fillRect(rect, color)
             
             # Draw border
-            border_color = QColor(0, 255, 0, 255)  # Solid green border
-            pen = QPen(border_color)
-            pen.setWidth(2)
-            painter.setPen(pen)
+            painter.setPen(self._flash_border_pen)
             painter.drawRect(rect)
             
             # Draw label
             if label:
                 # White text with black outline for visibility
-                painter.setPen(QPen(QColor(0, 0, 0, 255)))
-                painter.drawText(rect.left() + 6, rect.top() + 22, label)
-                painter.drawText(rect.left() + 4, rect.top() + 22, label)
-                painter.drawText(rect.left() + 5, rect.top() + 23, label)
-                painter.drawText(rect.left() + 5, rect.top() + 21, label)
-                painter.setPen(QPen(QColor(255, 255, 255, 255)))
-                painter.drawText(rect.left() + 5, rect.top() + 22, label)
+                # Glyph path is shaped once per flash and reused until it expires
+                path = flash.get('label_path')
+                if path is None:
+                    path = QPainterPath()
+                    path.addText(rect.left() + 5, rect.top() + 22, self._label_font, label)
+                    flash['label_path'] = path
+                painter.setRenderHint(QPainter.Antialiasing, True)
+                painter.strokePath(path, self._text_outline_pen)
+                painter.fillPath(path, self._text_brush)
+                painter.setRenderHint(QPainter.Antialiasing, False)
         
         painter.end()
         
@@ -336,14 +495,23 @@ def get_overlay():
         _overlay_instance = DebugOverlay()
     return _overlay_instance
 
+def shutdown_overlay():
+    """Stop and release the debug overlay singleton (if it was ever created)"""
+    global _overlay_instance
+    if _overlay_instance is not None:
+        _overlay_instance.refresh_timer.stop()
+        _overlay_instance.hide()
+        _overlay_instance.deleteLater()
+        _overlay_instance = None
+
 def show_scan_regions(window_capture, full_config, bottom_config=None):
     """
     Quick helper to show BOTH scan regions (static preview)
     
     Args:
         window_capture: WindowCapture instance with window_info
-        full_config: ARENA_OCR_REGION config dict
-        bottom_config: ARENA_OCR_BOTTOM_BAND config dict (optional)
+        full_config: ARENA_OCR_REGION config
+        bottom_config: ARENA_OCR_BOTTOM_BAND config (optional)
     """
     overlay = get_overlay()
     if window_capture.window_info:
@@ -374,6 +542,18 @@ def hide_overlay():
     overlay.hide()
     overlay.clear_regions()
 
+def begin_flash_batch():
+    """Collect following flashes into a single overlay repaint"""
+    overlay = get_overlay()
+    overlay.begin_batch()
+    return overlay
+
+def end_flash_batch():
+    """Repaint once for all flashes collected since begin_flash_batch"""
+    overlay = get_overlay()
+    overlay.end_batch()
+    return overlay
+
 def flash_power_detection(window_info, y_position, power_value, duration=1.0):
     """
     Flash a detection indicator at a Y position
@@ -1,25 +1,58 @@
 import sys
-import cv2
-import numpy as np
-from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QTextEdit, QMessageBox)
-from PyQt5.QtCore import Qt, QPoint, QRect
-from PyQt5.QtGui import QPainter, QPen, QPixmap, QImage
+import threading
+import time
+import traceback
+from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QMessageBox, QInputDialog)
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 import os
 
-
-from window_capture import WindowCapture
-from template_matcher import TemplateMatcher
 from region_selection import RegionSelectionWindow
 from utils import log_message, show_preview, show_error, show_info
 from config import (
-    GAME_WINDOW_TITLE, TEMPLATES_DIR, MIN_SELECTION_SIZE,
+    GAME_WINDOW_TITLE, TEMPLATES_DIR, MIN_SELECTION_SIZE, LOG_MAX_LINES,
     ARENA_OCR_REGION, ARENA_OCR_BOTTOM_BAND
 )
-from sequences.arenas import ArenasSequence
-from sequences.battle_sequence import ClassicArenaSequence
-from text_recognition import TextRecognizer
-from debug_overlay import get_overlay, hide_overlay
 
+# Capture, template matching and OCR (which load OpenCV/Tesseract) are imported
+# in DreamerApp._load_components once the window is on screen; sequences and the
+# debug overlay are imported inside the handlers that use them
+
+
+class _ResizeSignals(QObject):
+    """Signals for _ResizeTask (QRunnable itself can't emit)"""
+    finished = pyqtSignal(str, str)  # (result, error message)
+
+
+class _ResizeTask(QRunnable):
+    """Resizes the game window on a pool thread so the UI isn't blocked"""
+    def __init__(self, window_capture):
+        super().__init__()
+        self.window_capture = window_capture
+        self.signals = _ResizeSignals()
+    
+    def run(self):
+        try:
+            result = self.window_capture.resize_window()
+            self.signals.finished.emit(result, '')
+        except Exception as e:
+            self.signals.finished.emit('error', str(e))
+
+
+class _UIStopEvent(threading.Event):
+    """
+    Stop flag for sequences run on the UI thread.
+    wait() keeps processing Qt events, so the STOP button still gets clicked
+    (and ends the wait immediately) while a sequence is sleeping.
+    """
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_set():
+            QApplication.processEvents()
+            remaining = 0.05 if deadline is None else min(0.05, deadline - time.monotonic())
+            if remaining <= 0:
+                break
+            super().wait(remaining)
+        return self.is_set()
 
 
 class DreamerApp(QWidget):
@@ -28,36 +61,51 @@ class DreamerApp(QWidget):
         self.setWindowTitle('Dreamer - Window Scanner')
         self.setGeometry(100, 100, 900, 700)
         
-        # Initialize components
-        self.window_capture = WindowCapture(GAME_WINDOW_TITLE)
-        self.template_matcher = TemplateMatcher(self.window_capture)
+        # Components are built by _load_components after the window is shown
+        self.window_capture = None
+        self.template_matcher = None
+        self.text_recognizer = None
         self.last_frame = None
         self.overlay_visible = False
-        self.stop_requested = False  # Flag to stop running sequences
+        self.stop_event = _UIStopEvent()  # Set to stop running sequences
         
         # UI Setup (must be before text_recognizer since it logs on init)
         self.setup_ui()
         
-        # Initialize text recognizer after UI is ready (it logs on init)
+        # Queued so it runs once the event loop starts, after the window is shown
+        QTimer.singleShot(0, self._load_components)
+    
+    def _load_components(self):
+        """Import and create capture, matching and OCR, then resize the game window"""
+        QApplication.processEvents()  # Paint the window before OpenCV/Tesseract load
+        from window_capture import WindowCapture
+        from template_matcher import TemplateMatcher
+        from text_recognition import TextRecognizer
+        self.window_capture = WindowCapture(GAME_WINDOW_TITLE)
+        self.template_matcher = TemplateMatcher(self.window_capture)
         self.text_recognizer = TextRecognizer(self.window_capture, self.log)
         
         # Resize game window to target size for consistent OCR
         self._resize_game_window()
     
     def _resize_game_window(self):
-        """Resize the game window to the expected size (1734x703) if needed"""
-        try:
-            result = self.window_capture.resize_window()
-            if result == 'resized':
-                self.log('✓ Game window resized to 1734x703')
-            elif result == 'already_correct':
-                self.log('✓ Game window already at correct size (1734x703)')
-            elif result == 'not_found':
-                self.log('⚠ Could not find game window to resize')
-            else:
-                self.log('⚠ Could not resize game window')
-        except Exception as e:
-            self.log(f'⚠ Could not resize game window: {e}')
+        """Resize the game window to the expected size (1734x703) if needed, off the UI thread"""
+        self._resize_task = _ResizeTask(self.window_capture)
+        self._resize_task.signals.finished.connect(self._on_resize_finished)
+        QThreadPool.globalInstance().start(self._resize_task)
+    
+    def _on_resize_finished(self, result, error):
+        """Log the outcome of _resize_game_window (runs on the UI thread)"""
+        if error:
+            self.log(f'⚠ Could not resize game window: {error}')
+        elif result == 'resized':
+            self.log('✓ Game window resized to 1734x703')
+        elif result == 'already_correct':
+            self.log('✓ Game window already at correct size (1734x703)')
+        elif result == 'not_found':
+            self.log('⚠ Could not find game window to resize')
+        else:
+            self.log('⚠ Could not resize game window')
     
     def setup_ui(self):
         """Initialize UI components"""
@@ -87,8 +135,10 @@ class DreamerApp(QWidget):
         self.overlay_btn = QPushButton('Show Scan Regions')
         self.overlay_btn.clicked.connect(self.toggle_overlay)
         
-        self.log_output = QTextEdit()
+        # Plain text log capped at LOG_MAX_LINES (oldest lines drop off)
+        self.log_output = QPlainTextEdit()
         self.log_output.setReadOnly(True)
+        self.log_output.setMaximumBlockCount(LOG_MAX_LINES)
         
         btn_layout = QHBoxLayout()
         btn_layout.addWidget(self.add_template_btn)
@@ -113,20 +163,25 @@ class DreamerApp(QWidget):
     def log(self, message):
         log_message(self, message)
     
+    def closeEvent(self, event):
+        """Release the debug overlay and capture thread when the main window closes"""
+        from debug_overlay import shutdown_overlay
+        shutdown_overlay()
+        if self.window_capture is not None:
+            self.window_capture.close()
+        super().closeEvent(event)
+    
     def request_stop(self):
         """Request stop of running sequence"""
-        self.stop_requested = True
+        self.stop_event.set()
         self.log('')
         self.log('  ⚠ STOP REQUESTED - will stop after current action...')
         self.log('')
     
-    def is_stop_requested(self):
-        """Check if stop was requested"""
-        return self.stop_requested
-    
     def toggle_overlay(self):
         """Toggle the debug overlay showing scan regions"""
         try:
+            from debug_overlay import get_overlay, hide_overlay
             if self.overlay_visible:
                 # Hide overlay
                 hide_overlay()
@@ -171,7 +226,7 @@ class DreamerApp(QWidget):
     
     def save_template_region(self, region_frame):
         try:
-            from PyQt5.QtWidgets import QInputDialog
+            import cv2
             self.log(f'Region captured: {region_frame.shape}')
             self.show()
             self.raise_()
@@ -194,7 +249,6 @@ class DreamerApp(QWidget):
                 self.log('Template save cancelled')
         except Exception as e:
             self.log(f'✗ Error saving template: {e}')
-            import traceback
             traceback.print_exc()
             show_error(self, f'Failed to save template: {e}')
     
@@ -202,6 +256,7 @@ class DreamerApp(QWidget):
     
     def run_arenas_sequence(self):
         try:
+            from sequences.arenas import ArenasSequence
             sequence = ArenasSequence(self.window_capture, self.template_matcher, self.log)
             sequence.run()
         except Exception as e:
@@ -214,6 +269,7 @@ class DreamerApp(QWidget):
             self.log('\n[TEST MODE] Running Classic Arena SCAN test...')
             self.log('Make sure you are already on the Classic Arena screen!')
             
+            from sequences.battle_sequence import ClassicArenaSequence
             classic_arena = ClassicArenaSequence(
                 self.window_capture,
                 self.template_matcher,
@@ -225,7 +281,6 @@ class DreamerApp(QWidget):
             classic_arena.run(scan_only=True)
             
         except Exception as e:
-            import traceback
             self.log(f'✗ Error: {e}')
             self.log(traceback.format_exc())
             show_error(self, f'Test failed: {e}')
@@ -237,6 +292,7 @@ class DreamerApp(QWidget):
             self.log('Make sure you are already on the Classic Arena screen!')
             self.log('This will scan all opponents and attack the WEAKEST one.')
             
+            from sequences.battle_sequence import ClassicArenaSequence
             classic_arena = ClassicArenaSequence(
                 self.window_capture,
                 self.template_matcher,
@@ -248,7 +304,6 @@ class DreamerApp(QWidget):
             classic_arena.run(test_single_attack=True)
             
         except Exception as e:
-            import traceback
             self.log(f'✗ Error: {e}')
             self.log(traceback.format_exc())
             show_error(self, f'Test failed: {e}')
@@ -261,28 +316,28 @@ class DreamerApp(QWidget):
             self.log('This will scan all opponents and attack ALL available targets.')
             
             # Reset stop flag and enable stop button
-            self.stop_requested = False
+            self.stop_event.clear()
             self.stop_btn.setEnabled(True)
             
+            from sequences.battle_sequence import ClassicArenaSequence
             classic_arena = ClassicArenaSequence(
                 self.window_capture,
                 self.template_matcher,
                 self.text_recognizer,
                 self.log,
-                stop_check=self.is_stop_requested  # Pass stop check function
+                stop_event=self.stop_event  # Waits end as soon as STOP is pressed
             )
             
             # Run full attack mode (scan + attack all targets)
             classic_arena.run()
             
         except Exception as e:
-            import traceback
             self.log(f'✗ Error: {e}')
             self.log(traceback.format_exc())
             show_error(self, f'Full sequence failed: {e}')
         finally:
             self.stop_btn.setEnabled(False)
-            self.stop_requested = False
+            self.stop_event.clear()
 
 
 def main():
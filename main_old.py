@@ -1,14 +1,274 @@
 
+import os
+# One OpenMP thread per Tesseract call; parallelism comes from the OCR thread pool
+os.environ['OMP_THREAD_LIMIT'] = '1'
 import sys
 import time
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pyautogui
 import cv2
 import numpy as np
 import pygetwindow as gw
 import pytesseract
-from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QMessageBox, QLineEdit, QTextEdit, QHBoxLayout
+from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QMessageBox, QLineEdit, QTextEdit, QHBoxLayout, QInputDialog
 from PyQt5.QtGui import QPixmap, QImage
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QEventLoop, pyqtSignal
+
+from utils import click_at
+
+# mss grabs straight into a BGRA buffer (pyautogui goes through a PIL RGB image)
+try:
+	import mss
+except ImportError:
+	mss = None
+
+# Captured frames stay in the grabber's native channel layout:
+# layout -> (to-gray code, to-BGR code, QImage format)
+FRAME_LAYOUTS = {
+	'RGB': (cv2.COLOR_RGB2GRAY, cv2.COLOR_RGB2BGR, QImage.Format_RGB888),     # pyautogui
+	'BGRA': (cv2.COLOR_BGRA2GRAY, cv2.COLOR_BGRA2BGR, QImage.Format_RGB32),   # mss (alpha is 0xff)
+}
+
+# In-process Tesseract (loads the language model once instead of per call)
+try:
+	from tesserocr import PyTessBaseAPI, RIL, iterate_level
+	from PIL import Image
+except ImportError:
+	PyTessBaseAPI = None
+
+# Idle Tesseract APIs per PSM (a single API handle isn't thread-safe, so each OCR call
+# checks one out; the PSM is set once at creation). Only as many APIs exist as OCR calls
+# ever ran at once, however often the OCR pool replaces its threads
+_tess_free = {}
+_tess_apis = []
+_tess_apis_lock = threading.Lock()
+
+
+def _checkout_tess_api(psm):
+	"""Take an idle Tesseract API for psm, opening a new one if all are busy"""
+	with _tess_apis_lock:
+		free = _tess_free.setdefault(psm, [])
+		if free:
+			return free.pop()
+	api = PyTessBaseAPI(lang='eng', psm=psm)
+	with _tess_apis_lock:
+		_tess_apis.append(api)
+	return api
+
+
+def _return_tess_api(psm, api):
+	"""Hand an API taken with _checkout_tess_api back for the next OCR call"""
+	with _tess_apis_lock:
+		_tess_free.setdefault(psm, []).append(api)
+
+
+def close_tess_apis():
+	"""Release every Tesseract API (call once OCR work has stopped)"""
+	with _tess_apis_lock:
+		for api in _tess_apis:
+			api.End()
+		_tess_apis.clear()
+		_tess_free.clear()
+
+
+def ocr_image_to_data(img, psm):
+	"""
+	Run Tesseract word-level OCR on img with the given page segmentation mode.
+	Returns a pytesseract-style dict with 'text', 'left', 'top', 'width', 'height', 'conf' lists.
+	Falls back to a pytesseract subprocess when tesserocr isn't installed.
+	"""
+	if PyTessBaseAPI is None:
+		return pytesseract.image_to_data(img, config=f'--psm {psm}', output_type=pytesseract.Output.DICT)
+	
+	data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+	api = _checkout_tess_api(psm)
+	try:
+		api.SetImage(Image.fromarray(img))
+		api.Recognize()
+		
+		ri = api.GetIterator()
+		if ri is None:
+			return data
+		for word in iterate_level(ri, RIL.WORD):
+			box = word.BoundingBox(RIL.WORD)
+			if box is None:
+				continue
+			x1, y1, x2, y2 = box
+			data['text'].append(word.GetUTF8Text(RIL.WORD) or '')
+			data['left'].append(x1)
+			data['top'].append(y1)
+			data['width'].append(x2 - x1)
+			data['height'].append(y2 - y1)
+			data['conf'].append(word.Confidence(RIL.WORD))
+	finally:
+		_return_tess_api(psm, api)
+	return data
+
+
+# Max OCR results kept in DreamerApp._ocr_cache (see _store_ocr)
+OCR_CACHE_SIZE = 64
+
+
+def _crop_key(img):
+	"""
+	Exact content key of an OCR'd image for the OCR cache (shape + hash of every pixel),
+	so a changed number or name in the same layout never reuses old word boxes
+	"""
+	return (img.shape, hash(img.tobytes()))
+
+
+# UI transition detection (replaces fixed sleeps after clicks / between retries)
+CHANGE_POLL_INTERVAL = 0.05  # Seconds between thumbnail checks
+CHANGE_MIN_DISTANCE = 5      # dHash bits that must differ to count as a screen change
+
+
+def _dhash(gray):
+	"""64-bit difference hash of a gray frame (brighter-than-right-neighbour bits of a 9x8 thumbnail)"""
+	thumb = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+	bits = np.packbits(thumb[:, 1:] > thumb[:, :-1])
+	return int.from_bytes(bits.tobytes(), 'big')
+
+
+# White-text threshold levels for OCR preprocessing; THRESHOLD_LUT[v] is how many levels v exceeds
+THRESHOLD_LEVELS = (150, 170, 190)
+THRESHOLD_LUT = np.searchsorted(np.array(THRESHOLD_LEVELS), np.arange(256), side='left').astype(np.uint8)
+
+
+# Pixels kept around the last match (and between quadrants) when a text search retries
+RETRY_ROI_MARGIN = 50
+
+
+# Where each arenas step's label sits, as (x1, y1, x2, y2) fractions of the window.
+# OCR tries this crop first and only falls back to the whole frame if it misses.
+ROI_HINTS = {
+	'Battle': (0.7, 0.8, 1.0, 1.0),  # Bottom-right corner of the main screen
+}
+
+
+# Template sizes tried by find_and_click_template, relative to the saved template
+TEMPLATE_SCALES = (1.0, 0.9, 1.1, 0.8, 1.2)
+
+# Coarse-to-fine template search
+PYRAMID_LEVELS = 3             # pyrDown levels below full resolution
+PYRAMID_MIN_TEMPLATE = 16      # Smallest template side (px) worth matching at a coarse level
+COARSE_THRESHOLD_MARGIN = 0.1  # Coarse hits this far below threshold still get refined
+REFINE_MARGIN = 8              # Extra full-res pixels searched around a coarse hit
+EDGE_MIN_MAGNITUDE = 30.0      # Template Sobel gradients weaker than this are not used as edges
+FRAME_MIN_MAGNITUDE = 4.0      # Frame gradients weaker than this are treated as flat (noise)
+
+
+def _unit_gradients(gray, min_magnitude):
+	"""
+	Sobel gradient direction of a gray image as unit (ux, uy) float32 maps.
+	Pixels with a gradient below min_magnitude are zero and add nothing to a match.
+	"""
+	gx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+	gy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+	magnitude = cv2.magnitude(gx, gy)
+	edges = magnitude >= min_magnitude
+	inv = np.divide(1.0, magnitude, out=np.zeros_like(magnitude), where=edges)
+	return gx * inv, gy * inv
+
+
+def _build_pyramid(gray_frame):
+	"""Unit gradients of the full-res gray frame followed by PYRAMID_LEVELS half-size levels"""
+	levels = [gray_frame]
+	for _ in range(PYRAMID_LEVELS):
+		levels.append(cv2.pyrDown(levels[-1]))
+	return [_unit_gradients(level, FRAME_MIN_MAGNITUDE) for level in levels]
+
+
+def _shape_match(frame_grads, template_grads, edge_count):
+	"""
+	Shape-based similarity: mean over template edge pixels of the dot product
+	between template and frame gradient directions, at every offset.
+	1.0 is a perfect match; unaffected by brightness/contrast changes.
+	
+	Returns:
+		(max_val, max_loc)
+	"""
+	(ux, uy), (tx, ty) = frame_grads, template_grads
+	scores = cv2.add(cv2.matchTemplate(ux, tx, cv2.TM_CCORR), cv2.matchTemplate(uy, ty, cv2.TM_CCORR))
+	_, max_val, _, max_loc = cv2.minMaxLoc(scores)
+	return max_val / edge_count, max_loc
+
+
+def _template_gradients(template, wrap):
+	"""(wrapped unit gradients, edge pixel count) for a gray template"""
+	tx, ty = _unit_gradients(template, EDGE_MIN_MAGNITUDE)
+	edge_count = max(1, np.count_nonzero((tx != 0) | (ty != 0)))
+	return (wrap(tx), wrap(ty)), edge_count
+
+
+def _match_coarse_to_fine(pyramid, template, threshold, gpu_pyramid=None):
+	"""
+	Shape-match a gray template against a frame gradient pyramid.
+	Searches the coarsest level the template still fits, then re-matches
+	at full resolution only in a small window around the coarse hit.
+	Whole-level matches run on gpu_pyramid (UMat levels) when given; the
+	small refine window stays on the CPU.
+	
+	Returns:
+		(max_val, max_loc) with max_loc in full-res frame coordinates
+	"""
+	full_ux, full_uy = pyramid[0]
+	search = gpu_pyramid if gpu_pyramid is not None else pyramid
+	wrap = cv2.UMat if gpu_pyramid is not None else (lambda img: img)
+	th, tw = template.shape
+	
+	# Coarsest level where the template keeps enough detail
+	level = 0
+	for k in range(len(pyramid) - 1, 0, -1):
+		if min(th, tw) >> k >= PYRAMID_MIN_TEMPLATE:
+			level = k
+			break
+	
+	if level == 0:
+		return _shape_match(search[0], *_template_gradients(template, wrap))
+	
+	factor = 1 << level
+	small_template = cv2.resize(template, (tw // factor, th // factor), interpolation=cv2.INTER_AREA)
+	coarse_val, coarse_loc = _shape_match(search[level], *_template_gradients(small_template, wrap))
+	
+	if coarse_val < threshold - COARSE_THRESHOLD_MARGIN:
+		return coarse_val, (coarse_loc[0] * factor, coarse_loc[1] * factor)
+	
+	# Refine: full-res search window around the projected coarse location
+	pad = factor + REFINE_MARGIN
+	x0 = max(0, coarse_loc[0] * factor - pad)
+	y0 = max(0, coarse_loc[1] * factor - pad)
+	x1 = min(full_ux.shape[1], coarse_loc[0] * factor + tw + pad)
+	y1 = min(full_ux.shape[0], coarse_loc[1] * factor + th + pad)
+	window = (full_ux[y0:y1, x0:x1], full_uy[y0:y1, x0:x1])
+	max_val, max_loc = _shape_match(window, *_template_gradients(template, lambda img: img))
+	return max_val, (x0 + max_loc[0], y0 + max_loc[1])
+
+
+class _OCRJobSignals(QObject):
+	"""Signals for OCRJob (QRunnable itself can't emit)"""
+	finished = pyqtSignal(object, object)  # (job info, OCR dict or None)
+
+
+class OCRJob(QRunnable):
+	"""Runs one OCR pass on a pool thread and hands the result back via a signal"""
+	def __init__(self, info, img, psm, cancelled):
+		super().__init__()
+		self.info = info
+		self.img = img
+		self.psm = psm
+		self.cancelled = cancelled  # threading.Event set once a match was found
+		self.signals = _OCRJobSignals()
+	
+	def run(self):
+		ocr_data = None
+		if not self.cancelled.is_set():
+			try:
+				ocr_data = ocr_image_to_data(self.img, self.psm)
+			except Exception as e:
+				print(f'OCR pass failed: {e}')
+		self.signals.finished.emit(self.info, ocr_data)
 
 
 
@@ -53,6 +313,53 @@ class DreamerApp(QWidget):
 
 		self.last_frame = None
 		self.window_info = None
+		
+		# Frame (x, y, w, h) of the word each search text last matched, for ROI retries
+		self._last_successful_bbox = {}
+		
+		# Per-search-text match lookups (see _search_plan)
+		self._pat_cache = {}
+		
+		# CLAHE instance reused by every preprocess_for_ocr call
+		self._clahe = cv2.createCLAHE(clipLimit=5.0, tileGridSize=(8, 8))
+		
+		# Threshold variant buffers per upscaled image shape, reused across searches
+		self._thr_bufs = {}
+		
+		# Screen grabber, and the channel layout of the frames it returns
+		self._sct = mss.mss() if mss is not None else None
+		self._frame_layout = 'RGB' if self._sct is None else 'BGRA'
+		self._display_img = None  # Label-sized QImage that show_frame resizes frames into
+		
+		# OCR results keyed by (crop key, psm, preprocessing variant), see _crop_key
+		self._ocr_cache = {}
+		
+		# Template matching goes through OpenCV's T-API (UMat) when an OpenCL device exists
+		cv2.ocl.setUseOpenCL(cv2.ocl.haveOpenCL())
+		
+		# Gray templates per (path, mtime), pre-resized to every TEMPLATE_SCALES entry
+		self._template_cache = {}
+		
+		# Threads for matching all template scales at once
+		self._match_pool = ThreadPoolExecutor(max_workers=len(TEMPLATE_SCALES))
+		
+		# Own pool for OCR passes so queued ones can be dropped without touching other work
+		self._ocr_pool = QThreadPool()
+	
+	def _store_ocr(self, key, ocr_data):
+		"""Add an OCR result to the cache, evicting the oldest entry when full"""
+		if key not in self._ocr_cache and len(self._ocr_cache) >= OCR_CACHE_SIZE:
+			self._ocr_cache.pop(next(iter(self._ocr_cache)))
+		self._ocr_cache[key] = ocr_data
+
+	def closeEvent(self, event):
+		"""Stop OCR/matching work and release the Tesseract APIs when the window closes"""
+		self._match_pool.shutdown(wait=False, cancel_futures=True)
+		self._ocr_pool.clear()
+		self._ocr_pool.waitForDone()
+		if PyTessBaseAPI is not None:
+			close_tess_apis()
+		super().closeEvent(event)
 
 	def get_raid_window(self):
 		window = None
@@ -72,17 +379,55 @@ class DreamerApp(QWidget):
 		if not self.window_info:
 			self.get_raid_window()
 		left, top, width, height = self.window_info
-		screenshot = pyautogui.screenshot(region=(left, top, width, height))
-		frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+		# No colour conversion: OCR and gray matching don't care about channel order
+		if self._sct is None:
+			screenshot = pyautogui.screenshot(region=(left, top, width, height))
+			frame = np.asarray(screenshot)
+		else:
+			shot = self._sct.grab({'left': left, 'top': top, 'width': width, 'height': height})
+			frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
 		self.last_frame = frame
 		return frame
 
+	def _frame_dhash(self, frame):
+		"""dHash of a captured frame (see _dhash)"""
+		return _dhash(cv2.cvtColor(frame, FRAME_LAYOUTS[self._frame_layout][0]))
+
+	def _wait_for_change(self, prev_hash, timeout=3.0):
+		"""
+		Poll the window until it differs from the frame prev_hash was taken from.
+		
+		Returns:
+			True once the screen changed, False if timeout passed first
+		"""
+		deadline = time.monotonic() + timeout
+		while time.monotonic() < deadline:
+			QApplication.processEvents()
+			time.sleep(CHANGE_POLL_INTERVAL)
+			current = self._frame_dhash(self.capture_window())
+			if bin(current ^ prev_hash).count('1') > CHANGE_MIN_DISTANCE:
+				return True
+		return False
+
 	def show_frame(self, frame):
 		height, width, channel = frame.shape
-		bytes_per_line = 3 * width
-		q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format_BGR888)
-		pixmap = QPixmap.fromImage(q_img)
-		self.image_label.setPixmap(pixmap.scaled(self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+		label_size = self.image_label.size()
+		scale = min(label_size.width() / width, label_size.height() / height)
+		display_w, display_h = max(1, int(width * scale)), max(1, int(height * scale))
+		q_format = FRAME_LAYOUTS[self._frame_layout][2]
+		
+		# Keep one display image; only rebuild it when the label size or frame layout changes
+		img = self._display_img
+		if img is None or img.width() != display_w or img.height() != display_h or img.format() != q_format:
+			img = self._display_img = QImage(display_w, display_h, q_format)
+		
+		# Resize straight into the image's memory (bits() detaches it from the last pixmap first)
+		ptr = img.bits()
+		ptr.setsize(img.sizeInBytes())
+		rows = np.frombuffer(ptr, dtype=np.uint8).reshape(display_h, img.bytesPerLine())
+		dst = rows[:, :display_w * channel].reshape(display_h, display_w, channel)
+		cv2.resize(frame, (display_w, display_h), dst=dst, interpolation=cv2.INTER_LINEAR)
+		self.image_label.setPixmap(QPixmap.fromImage(img))
 
 	def capture_and_show(self):
 		try:
@@ -101,9 +446,6 @@ class DreamerApp(QWidget):
 			QMessageBox.warning(self, 'Warning', 'No screenshot available.')
 			return
 		
-		from PyQt5.QtWidgets import QInputDialog, QFileDialog
-		import os
-		
 		name, ok = QInputDialog.getText(self, 'Save Template', 'Enter template name:')
 		if ok and name:
 			# Create templates directory if it doesn't exist
@@ -111,7 +453,8 @@ class DreamerApp(QWidget):
 				os.makedirs('templates')
 			
 			filepath = f'templates/{name}.png'
-			cv2.imwrite(filepath, self.last_frame)
+			# Templates are stored as BGR; convert only here on the rare save path
+			cv2.imwrite(filepath, cv2.cvtColor(self.last_frame, FRAME_LAYOUTS[self._frame_layout][1]))
 			QMessageBox.information(self, 'Success', f'Template saved as {filepath}')
 
 	def search_text_in_screenshot(self):
@@ -132,6 +475,41 @@ class DreamerApp(QWidget):
 		except Exception as e:
 			QMessageBox.critical(self, 'Error', f'OCR failed: {e}')
 
+	def _load_scaled_templates(self, template_path):
+		"""
+		Gray template resized to every TEMPLATE_SCALES entry, as [(scale, template)].
+		Cached per path and file modification time, so a re-saved template is reloaded.
+		Returns None if the image can't be read.
+		"""
+		try:
+			key = (template_path, os.path.getmtime(template_path))
+		except OSError:
+			return None
+		scaled = self._template_cache.get(key)
+		if scaled is None:
+			template = cv2.imread(template_path)
+			if template is None:
+				return None
+			gray_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+			scaled = [(scale, cv2.resize(gray_template, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC))
+					  for scale in TEMPLATE_SCALES]
+			self._template_cache[key] = scaled
+		return scaled
+
+	def _match_one_scale(self, pyramid, gpu_pyramid, scaled_template, scale, threshold):
+		"""
+		Match an already scaled gray template against the frame gradient pyramid.
+		
+		Returns:
+			(found, max_val, max_loc, scale, (h, w) of the scaled template)
+		"""
+		frame_h, frame_w = pyramid[0][0].shape
+		if scaled_template.shape[0] > frame_h or scaled_template.shape[1] > frame_w:
+			return False, 0.0, (0, 0), scale, scaled_template.shape
+		
+		max_val, max_loc = _match_coarse_to_fine(pyramid, scaled_template, threshold, gpu_pyramid)
+		return max_val >= threshold, max_val, max_loc, scale, scaled_template.shape
+	
 	def find_and_click_template(self, template_path, threshold=0.8):
 		"""Find and click on a template image within the captured window"""
 		if not self.window_info:
@@ -142,28 +520,27 @@ class DreamerApp(QWidget):
 		self.show_frame(frame)
 		QApplication.processEvents()
 		
-		# Load template image
-		template = cv2.imread(template_path)
-		if template is None:
+		# Load template image (gray, pre-scaled, cached)
+		scaled_templates = self._load_scaled_templates(template_path)
+		if scaled_templates is None:
 			self.ocr_result.append(f'  ✗ Template image not found: {template_path}')
 			return False
 		
-		# Convert to grayscale for matching
-		gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-		gray_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+		# Convert to grayscale for matching, gradient pyramid is shared by all scales
+		gray_frame = cv2.cvtColor(frame, FRAME_LAYOUTS[self._frame_layout][0])
+		pyramid = _build_pyramid(gray_frame)
+		# Upload each level once so every scale matches on the OpenCL device
+		gpu_pyramid = [(cv2.UMat(ux), cv2.UMat(uy)) for ux, uy in pyramid] if cv2.ocl.useOpenCL() else None
 		
-		# Try template matching at multiple scales
-		for scale in [1.0, 0.9, 1.1, 0.8, 1.2]:
-			scaled_template = cv2.resize(gray_template, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-			
-			if scaled_template.shape[0] > gray_frame.shape[0] or scaled_template.shape[1] > gray_frame.shape[1]:
-				continue
-			
-			result = cv2.matchTemplate(gray_frame, scaled_template, cv2.TM_CCOEFF_NORMED)
-			min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-			
-			if max_val >= threshold:
-				h, w = scaled_template.shape
+		# Try template matching at all scales in parallel (OpenCV releases the GIL), first hit wins
+		futures = [self._match_pool.submit(self._match_one_scale, pyramid, gpu_pyramid, scaled_template, scale, threshold)
+				   for scale, scaled_template in scaled_templates]
+		try:
+			for future in as_completed(futures):
+				found, max_val, max_loc, scale, (h, w) = future.result()
+				if not found:
+					continue
+				
 				x = max_loc[0] + w // 2
 				y = max_loc[1] + h // 2
 				
@@ -174,147 +551,266 @@ class DreamerApp(QWidget):
 				self.ocr_result.append(f'  ✓ Found template (confidence: {max_val:.2%}, scale: {scale:.1f}x)')
 				QApplication.processEvents()
 				
-				pyautogui.moveTo(abs_x, abs_y, duration=0.3)
-				time.sleep(0.2)
-				pyautogui.click()
+				click_at(abs_x, abs_y)
 				return True
+		finally:
+			# Scales still queued aren't needed once one matched
+			for future in futures:
+				future.cancel()
 		
 		return False
 
-	def preprocess_for_ocr(self, frame):
-		"""Preprocess image to improve OCR accuracy on colored text"""
-		# Convert to grayscale
-		gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-		
-		# Try multiple preprocessing approaches
-		processed_images = []
-		
+	def preprocess_for_ocr(self, gray):
+		"""
+		Preprocess a grayscale frame to improve OCR accuracy on colored text.
+		Yields (name, image, scale_factor) one variant at a time so each can be
+		OCR'd and released before the next is built.
+		"""
 		# 1. Upscaled 3x - helps with very small text
 		upscaled3x = cv2.resize(gray, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
-		processed_images.append(('Upscaled 3x', upscaled3x, 3))
+		yield ('Upscaled 3x', upscaled3x, 3)
+		del upscaled3x
 		
 		# 2. Upscaled 2x with sharpening
 		upscaled2x = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-		kernel_sharp = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
-		sharpened = cv2.filter2D(upscaled2x, -1, kernel_sharp)
-		processed_images.append(('Upscaled 2x + Sharpened', sharpened, 2))
+		# Sharpen kernel [[-1,-1,-1],[-1,9,-1],[-1,-1,-1]] == 10*I - 3x3 box sum (separable, 16-bit so sums don't clip)
+		box_sum = cv2.boxFilter(upscaled2x, cv2.CV_16U, (3, 3), normalize=False)
+		sharpened = cv2.addWeighted(upscaled2x, 10.0, box_sum, -1.0, 0, dtype=cv2.CV_8U)
+		del box_sum
+		yield ('Upscaled 2x + Sharpened', sharpened, 2)
+		del sharpened
 		
-		# 3. Multiple threshold levels for white text
-		for thresh_val in [150, 170, 190]:
-			_, thresh = cv2.threshold(upscaled2x, thresh_val, 255, cv2.THRESH_BINARY)
-			processed_images.append((f'Upscaled Threshold {thresh_val}', thresh, 2))
+		# 3. Multiple threshold levels for white text from one read of the upscaled image:
+		# the LUT packs "how many levels this pixel exceeds" into one byte, and each
+		# level is unpacked into its reused buffer only when that variant is reached
+		# (same as THRESH_BINARY: strictly greater than the level -> 255)
+		packed = cv2.LUT(upscaled2x, THRESHOLD_LUT)
+		buffers = self._thr_bufs.get(packed.shape)
+		if buffers is None:
+			buffers = self._thr_bufs[packed.shape] = [np.empty_like(packed) for _ in THRESHOLD_LEVELS]
+		for k, (thresh_val, buf) in enumerate(zip(THRESHOLD_LEVELS, buffers)):
+			cv2.compare(packed, k, cv2.CMP_GT, dst=buf)
+			yield (f'Upscaled Threshold {thresh_val}', buf, 2)
+		del packed
 		
 		# 4. Aggressive CLAHE on upscaled
-		clahe = cv2.createCLAHE(clipLimit=5.0, tileGridSize=(8, 8))
-		enhanced = clahe.apply(upscaled2x)
-		processed_images.append(('CLAHE Strong', enhanced, 2))
+		enhanced = self._clahe.apply(upscaled2x)
+		yield ('CLAHE Strong', enhanced, 2)
+
+	def _search_plan(self, search_text):
+		"""
+		Per-search-text lookups for _find_text_match, cached since sequences
+		search for the same labels over and over.
+		
+		Returns:
+			(lowercased text, whether it has several words, {partial word: priority})
+		"""
+		plan = self._pat_cache.get(search_text)
+		if plan is None:
+			search_lower = search_text.lower()
+			search_words = search_lower.split()
+			partial_rank = {}
+			for rank, search_word in enumerate(search_words):
+				if len(search_word) > 3:
+					partial_rank.setdefault(search_word, rank)
+			plan = self._pat_cache[search_text] = (search_lower, len(search_words) > 1, partial_rank)
+		return plan
+	
+	def _find_text_match(self, ocr_data, search_text):
+		"""
+		Find search_text among the OCR'd words with fuzzy matching, in one pass.
+		A direct substring match wins, then a multi-word match over adjacent
+		words, then an exact match on one of the longer search words.
+		
+		Returns:
+			(word index, matched text, match type) or None
+		"""
+		search_lower, multi_word, partial_rank = self._search_plan(search_text)
+		texts = ocr_data['text']
+		words = [w.strip().lower() for w in texts]
+		
+		multi_match = None
+		partial_match = None  # (rank, index)
+		for i, word in enumerate(words):
+			if not word:
+				continue
+			# Method 1: Direct substring match
+			if search_lower in word:
+				return (i, texts[i], 'direct match')
+			# Method 2: Multi-word phrase detection (combine adjacent words)
+			if multi_word and multi_match is None and i + 1 < len(words) and words[i+1]:
+				combined = f"{word} {words[i+1]}"
+				if search_lower in combined or combined in search_lower:
+					# Use middle point between the two words
+					multi_match = (i, combined, 'multi-word match')
+			# Method 3: Partial word matching (earliest search word wins)
+			rank = partial_rank.get(word)
+			if rank is not None and (partial_match is None or rank < partial_match[0]):
+				partial_match = (rank, i)
 		
-		return processed_images
+		if multi_match:
+			return multi_match
+		if partial_match:
+			i = partial_match[1]
+			return (i, texts[i], f'partial match on "{words[i]}"')
+		return None
+	
+	def _run_ocr_passes(self, passes, text, crop_key):
+		"""
+		OCR (label, img, psm, variant, scale) passes on the OCR pool until one matches text.
+		Passes are pulled only as pool threads free up, so lazily built
+		preprocessing variants are still created on demand. The UI keeps
+		running in a local event loop while the passes work.
+		
+		Returns:
+			(ocr_data, match, label, scale) for the first matching pass, or None
+		"""
+		passes = iter(passes)
+		cancelled = threading.Event()
+		loop = QEventLoop()
+		jobs = []  # Keep jobs (and their signal objects) alive until they report
+		pending = 0
+		found = None
+		
+		def handle(info, ocr_data):
+			nonlocal found
+			label, psm, variant, scale = info
+			self._store_ocr((crop_key, psm, variant), ocr_data)
+			detected_words = [w.strip() for w in ocr_data['text'] if w.strip()]
+			self.ocr_result.append(f'  [{label}] Detected: {", ".join(detected_words[:20])}{"..." if len(detected_words) > 20 else ""}')
+			match = self._find_text_match(ocr_data, text)
+			if match:
+				found = (ocr_data, match, label, scale)
+		
+		def fill():
+			"""Keep every pool thread busy until passes run out or a match is found"""
+			nonlocal pending
+			while found is None and pending < self._ocr_pool.maxThreadCount():
+				try:
+					label, img, psm, variant, scale = next(passes)
+				except StopIteration:
+					return
+				info = (label, psm, variant, scale)
+				self.ocr_result.append(f'  [{label}] Scanning...')
+				cached = self._ocr_cache.get((crop_key, psm, variant))
+				if cached is not None:
+					handle(info, cached)
+					continue
+				job = OCRJob(info, img, psm, cancelled)
+				job.signals.finished.connect(on_finished)
+				jobs.append(job)
+				pending += 1
+				self._ocr_pool.start(job)
+		
+		def on_finished(info, ocr_data):
+			nonlocal pending
+			pending -= 1
+			if found is not None:
+				return  # Late result from a pass that was already running
+			if ocr_data is not None:
+				handle(info, ocr_data)
+			fill()
+			if found is not None or pending == 0:
+				loop.quit()
+		
+		fill()
+		if found is None and pending:
+			loop.exec_()
+		
+		# Drop passes that haven't started; running ones finish and are ignored
+		cancelled.set()
+		self._ocr_pool.clear()
+		return found
+	
+	def _retry_areas(self, gray, text):
+		"""
+		(name, crop, origin) areas OCR'd on a retry: a margin around where text
+		was last found, or the four frame quadrants (overlapping by the same
+		margin so a label on a boundary is still whole in one of them).
+		"""
+		h, w = gray.shape
+		m = RETRY_ROI_MARGIN
+		bbox = self._last_successful_bbox.get(text)
+		if bbox is not None:
+			x, y, bw, bh = bbox
+			x1, y1 = max(0, x - m), max(0, y - m)
+			return [('Last', gray[y1:min(h, y + bh + m), x1:min(w, x + bw + m)], (x1, y1))]
+		
+		areas = []
+		for n, (qx, qy) in enumerate(((0, 0), (1, 0), (0, 1), (1, 1)), start=1):
+			x1, y1 = max(0, qx * w // 2 - m), max(0, qy * h // 2 - m)
+			x2, y2 = min(w, (qx + 1) * w // 2 + m), min(h, (qy + 1) * h // 2 + m)
+			areas.append((f'Q{n}', gray[y1:y2, x1:x2], (x1, y1)))
+		return areas
 
+	def _click_ocr_word(self, ocr_data, i, scale_factor=1, origin=(0, 0)):
+		"""
+		Click the centre of OCR word i.
+		Coordinates are scaled back from upscaled images and offset by the
+		origin of the crop that was OCR'd.
+		"""
+		x = origin[0] + (ocr_data['left'][i] + ocr_data['width'][i] // 2) // scale_factor
+		y = origin[1] + (ocr_data['top'][i] + ocr_data['height'][i] // 2) // scale_factor
+		left, top, _, _ = self.window_info
+		click_at(left + x, top + y)
+	
 	def find_and_click_text(self, text, retries=3):
+		# Tesseract configs tried on the original frame
+		configs = [
+			(11, 'Sparse text'),
+			(6, 'Uniform block'),
+			(3, 'Auto page segmentation'),
+		]
+		
+		prev_hash = None  # dHash of the frame the previous attempt searched
 		for attempt in range(retries):
-			if attempt > 0:
+			if prev_hash is not None:
 				self.ocr_result.append(f'  Retry {attempt}/{retries-1}...')
-				QApplication.processEvents()
-				time.sleep(1.0)  # Wait before retry
+				# Retry as soon as the screen moves on, at most 1 s as before
+				self._wait_for_change(prev_hash, timeout=1.0)
 			
 			time.sleep(0.3)  # Brief pause before capture
 			frame = self.capture_window()
 			self.show_frame(frame)  # Show what we're seeing
-			QApplication.processEvents()  # Update UI
-			
-			# Helper function to find text with fuzzy matching
-			def find_text_match(ocr_data, search_text, scale_factor=1):
-				search_lower = search_text.lower()
-				search_words = search_lower.split()
-				
-				# Method 1: Direct substring match
-				for i, word in enumerate(ocr_data['text']):
-					if word.strip() and search_lower in word.lower():
-						return (i, word, 'direct match')
-				
-				# Method 2: Multi-word phrase detection (combine adjacent words)
-				if len(search_words) > 1:
-					for i in range(len(ocr_data['text']) - 1):
-						word1 = ocr_data['text'][i].strip().lower()
-						word2 = ocr_data['text'][i+1].strip().lower()
-						if word1 and word2:
-							combined = f"{word1} {word2}"
-							if search_lower in combined or combined in search_lower:
-								# Use middle point between the two words
-								return (i, f"{word1} {word2}", 'multi-word match')
-				
-				# Method 3: Partial word matching (for multi-word searches)
-				for search_word in search_words:
-					for i, word in enumerate(ocr_data['text']):
-						if len(search_word) > 3 and word.strip().lower() == search_word:
-							return (i, word, f'partial match on "{search_word}"')
-				
-				return None
 			
-			# Try OCR with different Tesseract configs
-			configs = [
-				('--psm 11', 'Sparse text'),
-				('--psm 6', 'Uniform block'),
-				('--psm 3', 'Auto page segmentation'),
-			]
-			
-			for config, config_name in configs:
-				self.ocr_result.append(f'  [Original - {config_name}] Scanning...')
-				QApplication.processEvents()
-				ocr_data = pytesseract.image_to_data(frame, config=config, output_type=pytesseract.Output.DICT)
-				detected_words = [w.strip() for w in ocr_data['text'] if w.strip()]
-				self.ocr_result.append(f'  Detected: {", ".join(detected_words[:20])}{"..." if len(detected_words) > 20 else ""}')
-				QApplication.processEvents()
-				
-				match_result = find_text_match(ocr_data, text)
-				if match_result:
-					i, matched_word, match_type = match_result
-					self.ocr_result.append(f'  ✓ Found "{matched_word}" ({match_type})')
-					QApplication.processEvents()
-					x = ocr_data['left'][i] + ocr_data['width'][i] // 2
-					y = ocr_data['top'][i] + ocr_data['height'][i] // 2
-					left, top, _, _ = self.window_info
-					abs_x = left + x
-					abs_y = top + y
-					
-					pyautogui.moveTo(abs_x, abs_y, duration=0.3)
-					time.sleep(0.2)
-					pyautogui.click()
-					return True
+			# Tesseract works on gray anyway; convert once for every OCR pass and preprocessing
+			gray = cv2.cvtColor(frame, FRAME_LAYOUTS[self._frame_layout][0])
+			prev_hash = _dhash(gray)
 			
-			# If not found, try preprocessed versions
-			processed_images = self.preprocess_for_ocr(frame)
+			if attempt > 0:
+				# Retries stay off the full frame (the first attempt already read it)
+				areas = self._retry_areas(gray, text)
+			else:
+				# Known label position first (far fewer pixels for Tesseract), then the whole frame
+				areas = []
+				if text in ROI_HINTS:
+					h, w = gray.shape
+					fx1, fy1, fx2, fy2 = ROI_HINTS[text]
+					x1, y1 = int(fx1 * w), int(fy1 * h)
+					areas.append(('ROI', gray[y1:int(fy2 * h), x1:int(fx2 * w)], (x1, y1)))
+				areas.append(('', gray, (0, 0)))
 			
-			for method_name, proc_img, scale_factor in processed_images:
-				self.ocr_result.append(f'  [{method_name}] Scanning...')
-				QApplication.processEvents()
-				
-				# Try each preprocessing with best PSM mode
-				ocr_data = pytesseract.image_to_data(proc_img, config='--psm 11', output_type=pytesseract.Output.DICT)
-				detected_words = [w.strip() for w in ocr_data['text'] if w.strip()]
-				self.ocr_result.append(f'  Detected: {", ".join(detected_words[:20])}{"..." if len(detected_words) > 20 else ""}')
-				QApplication.processEvents()
-				
-				match_result = find_text_match(ocr_data, text, scale_factor)
-				if match_result:
-					i, matched_word, match_type = match_result
-					self.ocr_result.append(f'  ✓ Found "{matched_word}" ({match_type}) using {method_name}')
-					QApplication.processEvents()
-					x = ocr_data['left'][i] + ocr_data['width'][i] // 2
-					y = ocr_data['top'][i] + ocr_data['height'][i] // 2
-					
-					# Adjust coordinates for upscaled images
-					x = x // scale_factor
-					y = y // scale_factor
-					
-					left, top, _, _ = self.window_info
-					abs_x = left + x
-					abs_y = top + y
-					
-					pyautogui.moveTo(abs_x, abs_y, duration=0.3)
-					time.sleep(0.2)
-					pyautogui.click()
+			for area_name, img, origin in areas:
+				prefix = f'{area_name} ' if area_name else ''
+				# Cached word boxes are relative to the crop, so results are keyed on its exact pixels
+				crop_key = _crop_key(img)
+				# Original image with each config, then preprocessed versions (built lazily) with sparse text
+				passes = itertools.chain(
+					((f'{prefix}Original - {config_name}', img, psm, 'original', 1) for psm, config_name in configs),
+					((f'{prefix}{method_name}', proc_img, 11, method_name, scale_factor)
+					 for method_name, proc_img, scale_factor in self.preprocess_for_ocr(img)),
+				)
+				found = self._run_ocr_passes(passes, text, crop_key)
+				if found:
+					ocr_data, (i, matched_word, match_type), label, scale_factor = found
+					self.ocr_result.append(f'  ✓ Found "{matched_word}" ({match_type}) using {label}')
+					self._last_successful_bbox[text] = (
+						origin[0] + ocr_data['left'][i] // scale_factor,
+						origin[1] + ocr_data['top'][i] // scale_factor,
+						ocr_data['width'][i] // scale_factor,
+						ocr_data['height'][i] // scale_factor,
+					)
+					self._click_ocr_word(ocr_data, i, scale_factor, origin)
 					return True
 		return False
 
@@ -329,7 +825,8 @@ class DreamerApp(QWidget):
 				found = self.find_and_click_text(step)
 				if found:
 					self.ocr_result.append(f'✓ Clicked on "{step}"')
-					time.sleep(2.0)  # Wait for UI to respond after click
+					# Wait for UI to respond after click (last_frame is the pre-click frame)
+					self._wait_for_change(self._frame_dhash(self.last_frame), timeout=2.0)
 				else:
 					self.ocr_result.append(f'✗ Could not find "{step}"')
 					break
@@ -340,6 +837,7 @@ class DreamerApp(QWidget):
 			QMessageBox.critical(self, 'Error', f'Arenas sequence failed: {e}')
 
 def main():
+	pyautogui.PAUSE = 0  # Waits are explicit; don't add 0.1 s to every pyautogui call
 	app = QApplication(sys.argv)
 	window = DreamerApp()
 	window.show()
@@ -1,3 +1,4 @@
+import traceback
 from PyQt5.QtWidgets import QWidget, QInputDialog, QMessageBox
 from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen
 from PyQt5.QtCore import Qt, QRect, QPoint
@@ -65,7 +66,6 @@ class RegionSelectionWindow(QWidget):
         except Exception as e:
             self.parent_app.show()
             self.parent_app.log(f'Error during selection: {e}')
-            import traceback
             traceback.print_exc()
 
     def keyPressEvent(self, event):
@@ -3,14 +3,22 @@ Battle Sequence - Handles attacking opponents and battle flow
 Uses smart scroll traversal to minimize scrolling
 """
 
+import queue
+import threading
 import time
-import pyautogui
+from collections import deque
+from itertools import islice
+import cv2
+import numpy as np
 
+from utils import click_at, press_escape
 from config import (
     ARENA_SCAN_DELAY,
     ARENA_SCROLL_DELAY,
     ARENA_BATTLE_DELAY,
     ARENA_BATTLE_BUTTON_X,
+    ARENA_AVAILABILITY_ROWS_ABOVE,
+    ARENA_AVAILABILITY_ROWS_BELOW,
     ARENA_MAX_BATTLES,
     ARENA_MAX_OPPONENT_POWER,
     ARENA_ATTACK_WEAKEST_FIRST,
@@ -25,6 +33,40 @@ from config import (
 )
 
 
+# wait_for_battle_complete poll interval: starts short, grows up to check_interval
+BATTLE_POLL_START = 0.3
+BATTLE_POLL_GROWTH = 1.5
+BATTLE_RESULT_POLL = 0.05  # How often wait_for_battle_complete checks the poll thread's queue
+
+# Frames whose 64-bit hashes differ by fewer bits than this count as unchanged,
+# so wait_for_battle_complete skips template matching on them
+FRAME_HASH_MIN_DISTANCE = 5
+# ...but matches anyway once this many seconds passed since the last match, so a
+# slow fade into "Battle Complete" (each step under the distance) is still caught
+BATTLE_FORCE_MATCH_INTERVAL = 5.0
+
+# A cached button position is trusted when the template matches this well around it
+BUTTON_CACHE_THRESHOLD = 0.9
+
+# Row layout prepare_targets filters and sorts on (index points back at the opponent dict)
+TARGET_DTYPE = np.dtype([('key', '<i8'), ('power', '<i8'), ('available', '?'), ('index', '<i4')])
+
+# cv2.img_hash (opencv-contrib) gives a perceptual hash; otherwise use a dHash
+_phash = cv2.img_hash.PHash_create() if hasattr(cv2, 'img_hash') else None
+
+
+def _frame_hash(frame):
+    """
+    64-bit perceptual hash of a BGR frame, as 8 packed bytes.
+    Compare two hashes with cv2.norm(a, b, cv2.NORM_HAMMING).
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if _phash is not None:
+        return _phash.compute(gray)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1])
+
+
 class BattleSequence:
     """
     Manages attacking opponents and the battle flow.
@@ -35,32 +77,52 @@ class BattleSequence:
     - Handles tier bracket changes that refresh the list
     """
     
-    def __init__(self, window_capture, opponent_scanner, template_matcher, log_func=None, stop_check=None):
+    def __init__(self, window_capture, opponent_scanner, template_matcher, log_func=None, stop_event=None, debug=True):
         self.window_capture = window_capture
         self.scanner = opponent_scanner  # OpponentScanner instance
         self.template_matcher = template_matcher
         self.log = log_func or print
-        self.stop_check = stop_check  # Function to check if stop requested
+        self.debug = debug  # Log per-click diagnostics
+        # Set to request a stop; waits use stop_event.wait() so they end as soon as it's set
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
         
         # Battle state
-        self.sorted_targets = []
-        self.current_target_index = 0
+        self.sorted_targets = deque()  # Targets not yet attempted (popped as they're attacked)
+        self.targets_attempted = 0  # For "[n/total]" logging
         self.battles_completed = 0
         self.max_battles = ARENA_MAX_BATTLES
         
         # List verification
         self.list_valid = True
+        
+        # Powers whose Battle button was seen gray; cleared when the list is refreshed
+        self._unavailable_powers = set()
+        
+        # (left, top, frame_width) for battle button clicks - fixed while the list is open
+        self._cached_geom = None
+        
+        # Template path -> (x, y, w, h) where that fixed-position button was last found
+        self._button_cache = {}
+        
+        # True while no fight has started since tokens were last seen (so at least one is left)
+        self._tokens_known = False
     
     def should_stop(self):
         """Check if stop was requested"""
-        return self.stop_check and self.stop_check()
+        return self.stop_event.is_set()
+    
+    def _debug_log(self, message, *args):
+        """Log only if debug mode is enabled (message is %-formatted with args only then)"""
+        if self.debug:
+            self.log(message % args if args else message)
         
     def reset(self):
         """Reset battle state"""
-        self.sorted_targets = []
-        self.current_target_index = 0
+        self.sorted_targets = deque()
+        self.targets_attempted = 0
         self.battles_completed = 0
         self.list_valid = True
+        self._cached_geom = None
     
     def prepare_targets(self, opponents, weakest_first=True, max_power=None):
         """
@@ -73,28 +135,33 @@ class BattleSequence:
         """
         self.reset()
         
-        # Start with all opponents
-        filtered = opponents
+        # Pack the fields used for filtering/sorting into one structured array
+        # ('key' is the sort key: power, negated for strongest first)
+        sign = 1 if weakest_first else -1
+        table = np.fromiter(
+            ((sign * o['power'], o['power'], o.get('available', True) and o['power'] not in self._unavailable_powers, i)
+             for i, o in enumerate(opponents)),
+            dtype=TARGET_DTYPE,
+            count=len(opponents)
+        )
+        
+        # Filter out unavailable (defeated) opponents and, if specified, those above max power
+        limit = max_power if max_power and max_power > 0 else None
+        keep = table['available']
+        defeated_count = len(table) - int(np.count_nonzero(keep))
+        if limit is not None:
+            keep = keep & (table['power'] <= limit)
+        table = table[keep]
         
-        # Filter out unavailable (defeated) opponents
-        available_opponents = [o for o in filtered if o.get('available', True)]
-        defeated_count = len(filtered) - len(available_opponents)
         if defeated_count > 0:
             self.log(f"  Filtered out {defeated_count} already defeated opponent(s)")
-        filtered = available_opponents
-        
-        # Filter by max power if specified
-        if max_power and max_power > 0:
-            before_count = len(filtered)
-            filtered = [o for o in filtered if o['power'] <= max_power]
-            self.log(f"  Filtered from {before_count} to {len(filtered)} opponents (max power: {max_power:,})")
-        
-        # Sort by power
-        self.sorted_targets = sorted(
-            filtered,
-            key=lambda x: x['power'],
-            reverse=not weakest_first
-        )
+        if limit is not None:
+            before_count = len(opponents) - defeated_count
+            self.log(f"  Filtered from {before_count} to {len(table)} opponents (max power: {max_power:,})")
+        
+        # Sort by power (stable, so equal powers keep scan order)
+        table.sort(order='key', kind='stable')
+        self.sorted_targets = deque(opponents[i] for i in table['index'])
         
         self._log_target_list()
         
@@ -108,7 +175,7 @@ class BattleSequence:
         self.log(f"  Targets sorted ({order}): {len(self.sorted_targets)} available")
         
         # Compact list - just show powers on one line
-        powers = [f"{o['power']:,}" for o in self.sorted_targets[:5]]  # First 5
+        powers = [f"{o['power']:,}" for o in islice(self.sorted_targets, 5)]  # First 5
         if len(self.sorted_targets) > 5:
             powers.append(f"...+{len(self.sorted_targets)-5} more")
         self.log(f"    Powers: {', '.join(powers)}")
@@ -131,29 +198,29 @@ class BattleSequence:
         if target_scroll != current_scroll:
             if target_scroll < current_scroll:
                 scrolls_needed = current_scroll - target_scroll
-                for i in range(scrolls_needed):
-                    self.scanner.scroll_list(direction='up')
+                self.scanner.scroll_list(direction='up', count=scrolls_needed)
             else:
                 scrolls_needed = target_scroll - current_scroll
-                for i in range(scrolls_needed):
-                    self.scanner.scroll_list(direction='down')
+                self.scanner.scroll_list(direction='down', count=scrolls_needed)
         
         # Verify target is visible
-        time.sleep(ARENA_SCAN_DELAY)
+        if self.stop_event.wait(ARENA_SCAN_DELAY):
+            return False
         
         if self.scanner.verify_opponent_at_position(target_power):
             return True
         
         # Try one scroll in each direction if not found
         self.scanner.scroll_list(direction='down')
-        time.sleep(ARENA_SCAN_DELAY)
+        if self.stop_event.wait(ARENA_SCAN_DELAY):
+            return False
         if self.scanner.verify_opponent_at_position(target_power):
             return True
         
         # Try up (2 scrolls to go past original)
-        self.scanner.scroll_list(direction='up')
-        self.scanner.scroll_list(direction='up')
-        time.sleep(ARENA_SCAN_DELAY)
+        self.scanner.scroll_list(direction='up', count=2)
+        if self.stop_event.wait(ARENA_SCAN_DELAY):
+            return False
         if self.scanner.verify_opponent_at_position(target_power):
             return True
         
@@ -184,16 +251,20 @@ class BattleSequence:
             self.log(f"    ✗ Could not find target Y position")
             return False
         
-        # Calculate button position
-        left, top, width, height = self.scanner.get_window_dimensions()
+        # Capture just the opponent's row to verify the button is available
+        band_y = max(0, y_pos - ARENA_AVAILABILITY_ROWS_ABOVE)
+        row = self.window_capture.capture_region(band_y, ARENA_AVAILABILITY_ROWS_ABOVE + ARENA_AVAILABILITY_ROWS_BELOW)
         
-        # Get frame to calculate x position AND verify button is available
-        frame = self.window_capture.capture()
-        frame_width = frame.shape[1]
+        # Calculate button position (window geometry is cached until reset/refresh)
+        if self._cached_geom is None:
+            left, top, _, _ = self.scanner.get_window_dimensions()
+            self._cached_geom = (left, top, row.shape[1])
+        left, top, frame_width = self._cached_geom
         
         # Verify opponent is still available (orange button, not defeated)
-        is_available = self.scanner.check_battle_available(frame, y_pos)
+        is_available = self.scanner.check_battle_available(row, y_pos - band_y)
         if not is_available:
+            self._unavailable_powers.add(target_power)
             self.log(f"    ✗ Opponent already defeated (gray button)")
             return False
         
@@ -205,14 +276,53 @@ class BattleSequence:
         BUTTON_Y_OFFSET = -50
         button_y = top + y_pos + BUTTON_Y_OFFSET
         
-        self.log(f"    Clicking Battle button at ({button_x}, {button_y}) [y_pos={y_pos}, offset={BUTTON_Y_OFFSET}]")
+        self._debug_log("    Clicking Battle button at (%d, %d) [y_pos=%d, offset=%d]", button_x, button_y, y_pos, BUTTON_Y_OFFSET)
         
-        pyautogui.moveTo(button_x, button_y, duration=0.3)
-        time.sleep(0.2)
-        pyautogui.click()
+        click_at(button_x, button_y)
         
         return True
     
+    def _click_cached_button(self, template_path, threshold=0.8, wait_after=1.0):
+        """
+        Find and click a button that sits at a fixed spot on screen.
+        After the first full-window search, only the area around the last
+        hit is matched; the full search is repeated if that fails.
+        
+        Args:
+            template_path: Button template image
+            threshold: Match threshold for the full-window search
+            wait_after: Seconds to wait after clicking
+            
+        Returns:
+            True if the button was found and clicked
+        """
+        time.sleep(0.3)  # Same settle delay as TemplateMatcher.find_and_click
+        location = None
+        
+        cached = self._button_cache.get(template_path)
+        if cached is not None:
+            x, y, w, h = cached
+            band_y = max(0, y - h)
+            band = self.window_capture.capture_region(band_y, 2 * h)
+            x0 = max(0, x - w)
+            found, roi_loc, _ = self.template_matcher.find_in_frame(
+                band[:, x0:x + w], template_path, max(threshold, BUTTON_CACHE_THRESHOLD)
+            )
+            if found:
+                location = (x0 + roi_loc[0], band_y + roi_loc[1])
+        
+        if location is None:
+            frame = self.window_capture.capture()
+            found, location, size = self.template_matcher.find_in_frame(frame, template_path, threshold)
+            if not found:
+                return False
+            self._button_cache[template_path] = location + size
+        
+        left, top, _, _ = self.window_capture.window_info
+        click_at(left + location[0], top + location[1])
+        time.sleep(wait_after)
+        return True
+    
     def click_start_fight(self):
         """
         Click the "Start Fight" button to begin the battle.
@@ -221,13 +331,14 @@ class BattleSequence:
         Returns:
             True if button was clicked successfully
         """
-        success, message = self.template_matcher.find_and_click(
+        success = self._click_cached_button(
             TEMPLATE_START_FIGHT,
             threshold=0.8,
             wait_after=1.0  # Short wait, battle loading handled separately
         )
         
         if success:
+            self._tokens_known = False  # Starting a fight spends a token
             return True
         else:
             self.log(f"    ✗ Start Fight button not found")
@@ -241,7 +352,13 @@ class BattleSequence:
             'ok' - Have tokens, proceed
             'refilled' - Got free tokens, proceed (scroll reset to top)
             'no_tokens' - No tokens and can't get free ones, need to exit
+        
+        The check is skipped ('ok') when tokens were seen and no fight has
+        started since, e.g. after a skipped target or before a refresh.
         """
+        if self._tokens_known:
+            return 'ok'
+        
         # Look for empty tokens indicator (very high threshold - 9/10 and 0/10 look nearly identical)
         found, location, size = self.template_matcher.find_template(
             TEMPLATE_EMPTY_ATOKENS,
@@ -249,6 +366,7 @@ class BattleSequence:
         )
         
         if not found:
+            self._tokens_known = True
             return 'ok'
         
         self.log(f"    ! Empty tokens - attempting refill...")
@@ -261,56 +379,118 @@ class BattleSequence:
             wait_after=1.5
         )
         
-        # Look for free tokens option
+        # Look for free tokens option - one capture, clicked where it was found
         time.sleep(0.5)
-        found_free, _, _ = self.template_matcher.find_template(
+        frame = self.window_capture.capture()
+        found_free, free_location, _ = self.template_matcher.find_in_frame(
+            frame,
             TEMPLATE_FREE_ATOKENS,
             threshold=0.8
         )
         
         if found_free:
-            self.template_matcher.find_and_click(
-                TEMPLATE_FREE_ATOKENS,
-                threshold=0.8,
+            self.template_matcher.click_at_offset(
+                free_location[0], free_location[1],
                 wait_after=2.0
             )
             self.log(f"    ✓ Tokens refilled (free)")
+            self._tokens_known = True
             # Reset scroll position - the list resets to top after refill
             self.scanner.current_scroll_position = 0
             return 'refilled'
         else:
             self.log(f"    ✗ No free tokens - out of tokens")
             # Press Escape to close the popup
-            import pyautogui
-            pyautogui.press('escape')
-            time.sleep(0.5)
+            press_escape()
+            time.sleep(0.3)
             return 'no_tokens'
     
+    def _poll_battle_complete(self, done, result_q, check_interval):
+        """
+        Worker for wait_for_battle_complete: capture + match until found or done is set.
+        Polls with a growing interval (0.3s, x1.5 each check, capped at
+        check_interval). Template matching only runs when the frame hash has
+        moved since the last match attempt, or BATTLE_FORCE_MATCH_INTERVAL
+        seconds after it.
+        
+        Args:
+            done: threading.Event set by the waiting thread to end polling
+            result_q: Queue that receives the (x, y) location, or the exception that stopped polling
+            check_interval: Longest wait between checks
+        """
+        poll = 0
+        last_hash = None
+        last_match = 0.0
+        try:
+            while not done.is_set():
+                frame = self.window_capture.capture()
+                frame_hash = _frame_hash(frame)
+                now = time.monotonic()
+                if (last_hash is None or
+                        now - last_match >= BATTLE_FORCE_MATCH_INTERVAL or
+                        cv2.norm(frame_hash, last_hash, cv2.NORM_HAMMING) >= FRAME_HASH_MIN_DISTANCE):
+                    last_hash = frame_hash
+                    last_match = now
+                    found, location, _ = self.template_matcher.find_in_frame(
+                        frame,
+                        TEMPLATE_BATTLE_COMPLETE,
+                        threshold=0.8
+                    )
+                    if found:
+                        result_q.put(location)
+                        return
+                
+                done.wait(min(check_interval, BATTLE_POLL_START * BATTLE_POLL_GROWTH ** poll))
+                poll += 1
+        except Exception as e:
+            result_q.put(e)
+    
     def wait_for_battle_complete(self, timeout=120, check_interval=3.0):
         """
         Wait for the battle to complete by looking for the "Battle Complete" screen.
-        Polls every check_interval seconds until found or timeout.
+        Capture and matching run on a background thread (_poll_battle_complete);
+        this thread only waits for its result, so a stop request is seen at once.
         
         Args:
             timeout: Maximum seconds to wait (default 120s = 2 minutes)
-            check_interval: Seconds between each check (default 3s)
+            check_interval: Longest wait between checks (default 3s)
             
         Returns:
             True if Battle Complete was found and clicked
+            (False on timeout or as soon as a stop is requested)
         """
-        start_time = time.time()
+        done = threading.Event()
+        result_q = queue.Queue(maxsize=1)
+        worker = threading.Thread(
+            target=self._poll_battle_complete,
+            args=(done, result_q, check_interval),
+            daemon=True
+        )
+        worker.start()
         
-        while time.time() - start_time < timeout:
-            success, message = self.template_matcher.find_and_click(
-                TEMPLATE_BATTLE_COMPLETE,
-                threshold=0.8,
-                wait_after=1.0  # Wait after clicking
-            )
-            
-            if success:
+        deadline = time.time() + timeout
+        try:
+            while time.time() < deadline:
+                try:
+                    result = result_q.get_nowait()
+                except queue.Empty:
+                    # stop_event.wait keeps the UI responsive while we wait
+                    if self.stop_event.wait(BATTLE_RESULT_POLL):
+                        return False
+                    continue
+                if self.should_stop():
+                    return False
+                
+                if isinstance(result, Exception):
+                    raise result
+                self.template_matcher.click_at_offset(
+                    result[0], result[1],
+                    wait_after=1.0  # Wait after clicking
+                )
                 return True
-            
-            time.sleep(check_interval)
+        finally:
+            done.set()
+            worker.join(timeout=1.0)
         
         self.log(f"    ✗ Timeout waiting for Battle Complete ({timeout}s)")
         return False
@@ -327,7 +507,7 @@ class BattleSequence:
             True if button was clicked successfully
         """
         for attempt in range(max_attempts):
-            success, message = self.template_matcher.find_and_click(
+            success = self._click_cached_button(
                 TEMPLATE_RETURN_ARENA,
                 threshold=0.8,
                 wait_after=1.5  # Wait for arena list to load
@@ -352,13 +532,18 @@ class BattleSequence:
         Returns:
             True if list is still valid, False if refreshed
         """
-        current_powers = self.scanner.get_current_visible_powers()
+        # Usually the top row alone confirms it - only OCR every row on a miss
+        first_power = self.scanner.get_first_visible_power()
+        if first_power in expected_powers_at_position:
+            self.log(f"    ✓ List verified (found expected opponent {first_power:,})")
+            return True
         
         # Check if at least one expected opponent is still visible
-        overlap = current_powers & expected_powers_at_position
+        current_powers = self.scanner.get_current_visible_powers()
+        match = next((p for p in expected_powers_at_position if p in current_powers), None)
         
-        if overlap:
-            self.log(f"    ✓ List verified (found {len(overlap)} expected opponent(s))")
+        if match is not None:
+            self.log(f"    ✓ List verified (found expected opponent {match:,})")
             return True
         else:
             self.log(f"    ✗ LIST CHANGED - expected powers not found!")
@@ -382,7 +567,7 @@ class BattleSequence:
         if not self.list_valid:
             return 'list_invalid'
         
-        if self.current_target_index >= len(self.sorted_targets):
+        if not self.sorted_targets:
             return 'no_more'
         
         if self.battles_completed >= self.max_battles:
@@ -393,25 +578,26 @@ class BattleSequence:
         if token_status == 'no_tokens':
             return 'no_tokens'
         
-        target = self.sorted_targets[self.current_target_index]
+        # Every outcome from here on moves past this target
+        target = self.sorted_targets.popleft()
+        self.targets_attempted += 1
         target_power = target['power']
         target_scroll = target.get('scroll_position', 0)
         target_y_pos = target.get('y_position')  # Use stored Y position
         current_scroll = self.scanner.scroll_count
         
-        self.log(f"  [{self.current_target_index+1}/{len(self.sorted_targets)}] Attacking Power {target['power']:,} (scroll {current_scroll}->{target_scroll})")
+        self.log(f"  [{self.targets_attempted}/{self.targets_attempted + len(self.sorted_targets)}] Attacking Power {target['power']:,} (scroll {current_scroll}->{target_scroll})")
         
         # Navigate to target
         if not self.navigate_to_target(target):
-            self.log(f"    ✗ Failed to navigate to opponent, skipping")
-            self.current_target_index += 1
+            if not self.should_stop():
+                self.log(f"    ✗ Failed to navigate to opponent, skipping")
             return 'skip'
         
         # Click opponent's battle button (opens team selection screen)
         # Use stored Y position from initial scan - more reliable than re-scanning
         if not self.click_battle_button(target_power, stored_y_position=target_y_pos):
             self.log(f"    ✗ Failed to click battle button, skipping")
-            self.current_target_index += 1
             return 'skip'
         
         # Wait for team selection screen to load
@@ -420,20 +606,18 @@ class BattleSequence:
         # Click "Start Fight" button to begin battle
         if not self.click_start_fight():
             self.log(f"    ✗ Failed to click Start Fight button")
-            self.current_target_index += 1
             return 'skip'
         
         # Wait for battle to complete
         if not self.wait_for_battle_complete():
-            self.log(f"    ✗ Battle completion not detected")
-            self.current_target_index += 1
+            if not self.should_stop():
+                self.log(f"    ✗ Battle completion not detected")
             return 'skip'
         
         # Wait 1 second then click Return Arena
         time.sleep(1.0)
         if not self.click_return_arena():
             self.log(f"    ✗ Failed to return to arena")
-            self.current_target_index += 1
             return 'skip'
         
         # Game resets to top of list after battle - update scroll tracking
@@ -442,7 +626,6 @@ class BattleSequence:
         # Wait for arena list to fully load
         time.sleep(2.0)
         
-        self.current_target_index += 1
         self.battles_completed += 1
         self.log(f"    ✓ Battle {self.battles_completed} complete")
         
@@ -502,33 +685,15 @@ class BattleSequence:
             True if the first opponent is the same as our last undefeated target
         """
         # If we attacked all targets, no need to refresh
-        if self.current_target_index >= len(self.sorted_targets):
+        if not self.sorted_targets:
             return False
         
         # Get the next target we couldn't defeat (too strong)
-        remaining_target = self.sorted_targets[self.current_target_index]
+        remaining_target = self.sorted_targets[0]
         remaining_power = remaining_target['power']
         
         # Quick scan of first visible opponent
-        time.sleep(ARENA_SCAN_DELAY)
-        frame = self.window_capture.capture()
-        height, width = frame.shape[:2]
-        
-        # Scan a region where the first opponent's Team Power would be
-        from config import ARENA_OCR_REGION
-        roi_x = int(width * ARENA_OCR_REGION['x_start'])
-        roi_y = int(height * ARENA_OCR_REGION['y_start'])
-        roi_w = int(width * ARENA_OCR_REGION['width'])
-        # Just scan top portion for first opponent
-        roi_h = int(height * 0.25)
-        
-        roi_frame = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
-        powers = self.scanner.text_recognizer.find_all_team_powers(roi_frame)
-        
-        if powers:
-            first_power = powers[0]['power']
-            return first_power == remaining_power
-        return False
+        return self.scanner.get_first_visible_power() == remaining_power
     
     def click_refresh_list(self):
         """
@@ -539,7 +704,7 @@ class BattleSequence:
             True if button was clicked successfully
         """
         # Try Free Refresh first
-        success, _ = self.template_matcher.find_and_click(
+        success = self._click_cached_button(
             TEMPLATE_FREE_REFRESH,
             threshold=0.8,
             wait_after=2.0
@@ -547,6 +712,8 @@ class BattleSequence:
         
         if success:
             self.log(f"  Refreshing opponent list (free)...")
+            self._cached_geom = None
+            self._unavailable_powers.clear()
             return True
         
         # Try Pay Refresh if free not available
@@ -558,6 +725,8 @@ class BattleSequence:
         
         if success:
             self.log(f"  Refreshing opponent list (paid)...")
+            self._cached_geom = None
+            self._unavailable_powers.clear()
             return True
         
         self.log(f"    \u2717 No refresh button found")
@@ -581,28 +750,27 @@ class ClassicArenaSequence:
     Combines OpponentScanner and BattleSequence.
     """
     
-    def __init__(self, window_capture, template_matcher, text_recognizer, log_func=None, stop_check=None):
+    def __init__(self, window_capture, template_matcher, text_recognizer, log_func=None, stop_event=None):
         self.window_capture = window_capture
         self.template_matcher = template_matcher
         self.text_recognizer = text_recognizer
         self.log = log_func or print
-        self.stop_check = stop_check  # Function to check if stop was requested
+        # threading.Event set when stop is requested (shared with BattleSequence)
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
         
         # Import here to avoid circular import
         from sequences.opponent_scanner import OpponentScanner
         
         # Create scanner and battle sequence
         self.scanner = OpponentScanner(window_capture, text_recognizer, log_func)
-        self.battle_seq = BattleSequence(window_capture, self.scanner, template_matcher, log_func, stop_check)
+        self.battle_seq = BattleSequence(window_capture, self.scanner, template_matcher, log_func, self.stop_event)
         
         # State
         self.opponents = []
     
     def should_stop(self):
         """Check if stop was requested"""
-        if self.stop_check and self.stop_check():
-            return True
-        return False
+        return self.stop_event.is_set()
     
     def run(self, max_battles=None, scan_only=False, test_single_attack=False):
         """
@@ -3,11 +3,14 @@ Opponent Scanner - Handles scanning and tracking Arena opponents
 Focused on acquiring opponent data with scroll position tracking
 """
 
+import queue
+import threading
 import time
-import pyautogui
+from collections import OrderedDict
 import cv2
 import numpy as np
 
+from utils import drag_vertical
 from config import (
     ARENA_SCAN_DELAY,
     ARENA_SCROLL_DELAY,
@@ -15,10 +18,69 @@ from config import (
     ARENA_MAX_SCROLL_ATTEMPTS,
     ARENA_OCR_REGION,
     ARENA_OCR_BOTTOM_BAND,
+    ARENA_OCR_FIRST_ROW_HEIGHT,
+    ARENA_OCR_TEXT_MASK,
+    ARENA_OCR_TEXT_HSV_LOW,
+    ARENA_OCR_TEXT_HSV_HIGH,
+    ARENA_OCR_SCALE,
     ARENA_LIST_REGION,
     ARENA_BATTLE_BUTTON_X,
+    ARENA_AVAILABILITY_ROWS_ABOVE,
+    ARENA_AVAILABILITY_ROWS_BELOW,
 )
 
+# HSV bounds (inclusive) of the orange Battle button: hue 10-35, saturation >150, any value
+ORANGE_HSV_LOW = np.array([10, 151, 0], dtype=np.uint8)
+ORANGE_HSV_HIGH = np.array([35, 255, 255], dtype=np.uint8)
+ORANGE_MIN_PERCENT = 15  # Share of orange pixels above which the button counts as available
+
+# HSV bounds (inclusive) of the Team Power text, see ARENA_OCR_TEXT_MASK
+TEXT_HSV_LOW = np.array(ARENA_OCR_TEXT_HSV_LOW, dtype=np.uint8)
+TEXT_HSV_HIGH = np.array(ARENA_OCR_TEXT_HSV_HIGH, dtype=np.uint8)
+
+# Recent OCR-region reads kept by _read_powers (keyed on the exact ROI pixels)
+OCR_CACHE_SIZE = 4
+
+# CaptureWorker: seconds between background captures, and the longest the
+# scanner waits for a fresh one before capturing itself
+CAPTURE_WORKER_INTERVAL = 0.2
+CAPTURE_WORKER_TIMEOUT = 2.0
+
+
+class CaptureWorker(threading.Thread):
+    """
+    Captures the game window in the background during a full scan, so a
+    frame is already waiting when the scanner finishes its settle delay.
+    Keeps only the newest frames in out_q as (capture start time, frame).
+    """
+    
+    def __init__(self, window_capture, stop_event, out_q, interval=CAPTURE_WORKER_INTERVAL):
+        super().__init__(daemon=True)
+        self.window_capture = window_capture
+        self.stop_event = stop_event
+        self.out_q = out_q
+        self.interval = interval
+    
+    def run(self):
+        while not self.stop_event.is_set():
+            started = time.time()
+            try:
+                frame = self.window_capture.capture()
+            except Exception:
+                self.stop_event.wait(self.interval)
+                continue
+            # Drop the oldest frame when the queue is full
+            while True:
+                try:
+                    self.out_q.put_nowait((started, frame))
+                    break
+                except queue.Full:
+                    try:
+                        self.out_q.get_nowait()
+                    except queue.Empty:
+                        pass
+            self.stop_event.wait(self.interval)
+
 
 class OpponentScanner:
     """
@@ -43,12 +105,35 @@ class OpponentScanner:
         # Deduplication
         self.known_powers = set()
         
+        # Power -> Battle button available, for the current scan
+        # (a button doesn't change color mid-scan; repeat sightings reuse the first reading)
+        self._availability_cache = {}
+        
+        # Exact-pixel key of the last scanned OCR region and what it read (see scan_visible_opponents)
+        self._last_roi_key = None
+        self._last_visible = []
+        
+        # Background capture during run_full_scan (see CaptureWorker)
+        self._capture_worker = None
+        self._capture_stop = None
+        self._capture_q = None
+        self._frames_after = 0.0  # Frames captured before this time show a stale list
+        
+        # Frame buffer reused by every direct capture (see _capture)
+        self._frame_buf = None
+        
+        # (ROI position, ROI content hash) -> powers, most recent last (see _read_powers)
+        self._ocr_cache = OrderedDict()
+        
     def reset(self):
         """Reset scanner state for a new scan"""
         self.opponents = []
         self.scroll_count = 0
         self.max_scroll_reached = 0
         self.known_powers = set()
+        self._availability_cache = {}
+        self._last_roi_key = None
+        self._last_visible = []
     
     def get_window_dimensions(self):
         """Get current window dimensions"""
@@ -61,10 +146,10 @@ class OpponentScanner:
         height, width = frame.shape[:2]
         region = ARENA_OCR_BOTTOM_BAND if use_bottom_band else ARENA_OCR_REGION
         
-        x = int(width * region['x_start'])
-        y = int(height * region['y_start'])
-        w = int(width * region['width'])
-        h = int(height * region['height'])
+        x = int(width * region.x_start)
+        y = int(height * region.y_start)
+        w = int(width * region.width)
+        h = int(height * region.height)
         
         return (x, y, w, h)
     
@@ -97,100 +182,191 @@ class OpponentScanner:
         except Exception:
             pass
     
-    def check_battle_available(self, frame, y_position):
+    def _begin_flash_batch(self):
+        """Start collecting detection flashes for the current frame"""
+        try:
+            from debug_overlay import begin_flash_batch
+            begin_flash_batch()
+        except Exception:
+            pass
+    
+    def _end_flash_batch(self):
+        """Show all detection flashes collected for the current frame at once"""
+        try:
+            from debug_overlay import end_flash_batch
+            end_flash_batch()
+        except Exception:
+            pass
+    
+    def orange_mask(self, frame):
         """
-        Check if the Battle button is available (orange) or defeated (gray).
-        Uses pixel color sampling in the Battle button region.
-        
-        This is SEPARATE from OCR - keeps text recognition generic and reusable.
+        Orange-pixel mask of the Battle button column, for the whole frame height.
+        Build it once per frame and pass it to check_battle_available for every
+        opponent on that frame.
         
         Args:
             frame: The captured screenshot (BGR format)
-            y_position: Y position where Team Power text was found
             
         Returns:
-            True if Battle button is orange (available), False if gray (defeated)
+            uint8 mask (255 = orange) of the sampling stripe, frame height x stripe width
         """
-        height, width = frame.shape[:2]
+        width = frame.shape[1]
         
         # Battle button X position (right side of screen)
         button_x = int(width * ARENA_BATTLE_BUTTON_X)
         
         # Sample a vertical stripe at the button X position
         # This is more robust than a small square because Y estimates can be off
-        # Sample from y-80 to y+20 to cover the whole opponent row area
         sample_width = 40  # Horizontal sampling width
         x_start = max(0, button_x - sample_width // 2)
         x_end = min(width, button_x + sample_width // 2)
         
-        # Vertical range: cover most of the opponent row height
-        y_start = max(0, y_position - 80)
-        y_end = min(height, y_position + 20)
-        
-        # Extract the sample region
-        sample_region = frame[y_start:y_end, x_start:x_end]
-        
-        if sample_region.size == 0:
-            self.log(f"      Warning: Empty sample region for availability check")
-            return True  # Assume available if we can't check
-        
         # Convert to HSV for color analysis
-        hsv = cv2.cvtColor(sample_region, cv2.COLOR_BGR2HSV)
+        hsv = cv2.cvtColor(frame[:, x_start:x_end], cv2.COLOR_BGR2HSV)
         
         # Orange Battle button: Hue ~15-25, high saturation (>150)
         # Victory badge: Hue ~80-100 (greenish from wings), varying saturation
         # Gray elements: Low saturation
         
+        # Orange hue: 10-35, high saturation: >150 (single inRange pass, no per-channel temporaries)
+        return cv2.inRange(hsv, ORANGE_HSV_LOW, ORANGE_HSV_HIGH)
+    
+    def check_battle_available(self, frame, y_position, mask=None):
+        """
+        Check if the Battle button is available (orange) or defeated (gray).
+        Uses pixel color sampling in the Battle button region.
+        
+        This is SEPARATE from OCR - keeps text recognition generic and reusable.
+        
+        Args:
+            frame: The captured screenshot (BGR format)
+            y_position: Y position where Team Power text was found
+            mask: orange_mask(frame), if already built for this frame
+            
+        Returns:
+            True if Battle button is orange (available), False if gray (defeated)
+        """
+        if mask is None:
+            mask = self.orange_mask(frame)
+        height = mask.shape[0]
+        
+        # Vertical range: cover most of the opponent row height (y-80 to y+20)
+        y_start = max(0, y_position - ARENA_AVAILABILITY_ROWS_ABOVE)
+        y_end = min(height, y_position + ARENA_AVAILABILITY_ROWS_BELOW)
+        
+        # Extract the sample region
+        sample_mask = mask[y_start:y_end]
+        
+        if sample_mask.size == 0:
+            self.log(f"      Warning: Empty sample region for availability check")
+            return True  # Assume available if we can't check
+        
         # Count pixels that are orange (not just average)
-        # Orange hue: 10-35, high saturation: >150
-        orange_mask = (
-            (hsv[:, :, 0] >= 10) & (hsv[:, :, 0] <= 35) &  # Orange hue
-            (hsv[:, :, 1] > 150)  # High saturation
-        )
-        orange_pixel_count = np.sum(orange_mask)
-        total_pixels = sample_region.shape[0] * sample_region.shape[1]
-        orange_ratio = orange_pixel_count / total_pixels if total_pixels > 0 else 0
+        orange_pixel_count = cv2.countNonZero(sample_mask)
+        total_pixels = sample_mask.size  # > 0, checked above
         
-        # If more than 15% of the sample is orange, the button is available
-        is_available = orange_ratio > 0.15
+        # If more than ORANGE_MIN_PERCENT of the sample is orange, the button is available
+        # (integer comparison - no per-call float ratio)
+        is_available = orange_pixel_count * 100 > total_pixels * ORANGE_MIN_PERCENT
         
         return is_available
     
-    def scroll_list(self, direction='down'):
+    def _capture(self):
+        """
+        Capture the window into the scanner's reusable frame buffer.
+        The frame is only valid until the next _capture call.
+        """
+        self._frame_buf = self.window_capture.capture(out=self._frame_buf)
+        return self._frame_buf
+    
+    def _start_capture_worker(self):
+        """Start background captures (run_full_scan only)"""
+        self._capture_stop = threading.Event()
+        self._capture_q = queue.Queue(maxsize=2)
+        self._frames_after = time.time()
+        self._capture_worker = CaptureWorker(self.window_capture, self._capture_stop, self._capture_q)
+        self._capture_worker.start()
+    
+    def _stop_capture_worker(self):
+        """Stop background captures and drop any queued frames"""
+        if self._capture_worker is None:
+            return
+        self._capture_stop.set()
+        self._capture_worker.join(timeout=CAPTURE_WORKER_TIMEOUT)
+        self._capture_worker = None
+        self._capture_q = None
+    
+    def _drain_frames(self):
+        """Discard background frames taken before now (the list just moved)"""
+        self._frames_after = time.time()
+        if self._capture_q is not None:
+            while True:
+                try:
+                    self._capture_q.get_nowait()
+                except queue.Empty:
+                    break
+    
+    def _next_frame(self):
+        """
+        Newest frame of the settled list: from the CaptureWorker when one is
+        running, otherwise (or if it has nothing fresh in time) a direct capture
+        """
+        if self._capture_q is not None:
+            frame = None
+            deadline = time.time() + CAPTURE_WORKER_TIMEOUT
+            while frame is None and time.time() < deadline:
+                try:
+                    started, candidate = self._capture_q.get(timeout=CAPTURE_WORKER_TIMEOUT)
+                except queue.Empty:
+                    break
+                if started >= self._frames_after:
+                    frame = candidate
+            # Take anything newer that's already queued
+            while frame is not None:
+                try:
+                    _, frame = self._capture_q.get_nowait()
+                except queue.Empty:
+                    break
+            if frame is not None:
+                return frame
+        return self._capture()
+    
+    def scroll_list(self, direction='down', count=1):
         """
         Scroll the opponent list
         
         Args:
             direction: 'down' to see more opponents, 'up' to go back
+            count: Number of scroll steps, dragged back to back with one
+                   settle delay at the end
             
         Returns:
             The new scroll position
         """
+        if count <= 0:
+            return self.scroll_count
+        
         left, top, width, height = self.get_window_dimensions()
-        center_x = left + int(width * ARENA_LIST_REGION['x_center'])
+        center_x = left + int(width * ARENA_LIST_REGION.x_center)
         
         if direction == 'down':
-            start_y = top + int(height * ARENA_LIST_REGION['y_end'])
-            end_y = top + int(height * ARENA_LIST_REGION['y_start'])
+            start_y = top + int(height * ARENA_LIST_REGION.y_end)
+            end_y = top + int(height * ARENA_LIST_REGION.y_start)
         else:
-            start_y = top + int(height * ARENA_LIST_REGION['y_start'])
-            end_y = top + int(height * ARENA_LIST_REGION['y_end'])
-        
-        pyautogui.moveTo(center_x, start_y, duration=0.2)
-        time.sleep(0.1)
-        pyautogui.mouseDown()
-        time.sleep(0.1)
-        pyautogui.moveTo(center_x, end_y, duration=ARENA_SCROLL_DURATION)
-        # Hold mouse down after scroll to stop inertia (phone-like scrolling)
-        time.sleep(0.3)
-        pyautogui.mouseUp()
+            start_y = top + int(height * ARENA_LIST_REGION.y_start)
+            end_y = top + int(height * ARENA_LIST_REGION.y_end)
+        
+        for _ in range(count):
+            # Hold mouse down after scroll to stop inertia (phone-like scrolling)
+            drag_vertical(center_x, start_y, end_y, ARENA_SCROLL_DURATION, hold=0.3)
         
         time.sleep(ARENA_SCROLL_DELAY)
+        self._drain_frames()
         
         if direction == 'down':
-            self.scroll_count += 1
+            self.scroll_count += count
         else:
-            self.scroll_count = max(0, self.scroll_count - 1)
+            self.scroll_count = max(0, self.scroll_count - count)
         
         return self.scroll_count
     
@@ -213,14 +389,12 @@ class OpponentScanner:
             # Need to scroll up
             scrolls_needed = current - target_position
             self.log(f"  Scrolling UP {scrolls_needed} time(s) to position {target_position}...")
-            for _ in range(scrolls_needed):
-                self.scroll_list(direction='up')
+            self.scroll_list(direction='up', count=scrolls_needed)
         else:
             # Need to scroll down
             scrolls_needed = target_position - current
             self.log(f"  Scrolling DOWN {scrolls_needed} time(s) to position {target_position}...")
-            for _ in range(scrolls_needed):
-                self.scroll_list(direction='down')
+            self.scroll_list(direction='down', count=scrolls_needed)
         
         return self.scroll_count == target_position
     
@@ -233,28 +407,65 @@ class OpponentScanner:
         """
         time.sleep(ARENA_SCAN_DELAY)
         
-        frame = self.window_capture.capture()
+        frame = self._next_frame()
         height, width = frame.shape[:2]
         
         roi_x, roi_y, roi_w, roi_h = self.get_ocr_region(frame, use_bottom_band=use_bottom_band)
         roi_frame = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
         
+        # The scroll didn't move anything (e.g. end of list): same result as last time, no OCR.
+        # Keyed on the exact ROI pixels like _read_powers; a perceptual hash can't tell
+        # apart power rows that differ only in their digits
+        roi_key = (use_bottom_band, roi_x, roi_y, roi_frame.shape, hash(roi_frame.tobytes()))
+        if roi_key == self._last_roi_key:
+            self.log(f"    Scroll {self.scroll_count}: unchanged since last scan")
+            return self._last_visible
+        
+        if ARENA_OCR_TEXT_MASK:
+            # Keep only the white text so Tesseract sees a clean, high-contrast image
+            text_mask = cv2.inRange(cv2.cvtColor(roi_frame, cv2.COLOR_BGR2HSV), TEXT_HSV_LOW, TEXT_HSV_HIGH)
+            roi_frame = cv2.bitwise_and(roi_frame, roi_frame, mask=text_mask)
+        
+        if ARENA_OCR_SCALE != 1.0:
+            # Fewer pixels for Tesseract; Y positions are scaled back below
+            roi_frame = cv2.resize(roi_frame, None, fx=ARENA_OCR_SCALE, fy=ARENA_OCR_SCALE, interpolation=cv2.INTER_AREA)
+        
         powers = self.text_recognizer.find_all_team_powers(roi_frame)
         
-        visible = []
+        # One HSV pass over the Battle button column serves every opponent on this frame
+        # (built on the first opponent not already in the availability cache)
+        mask = None
+        
+        # Collect fields column-wise, then build the opponent dicts in one pass
+        ys, ps, raws, avails = [], [], [], []
         for i, p in enumerate(powers):
-            y_pos = (p['y_position'] or (i * 100 + 50)) + roi_y
-            is_available = self.check_battle_available(frame, y_pos)
-            
-            opponent = {
-                'power': p['power'],
-                'y_position': y_pos,
-                'scroll_position': self.scroll_count,
-                'raw_text': p.get('raw_text', ''),
-                'available': is_available
-            }
-            visible.append(opponent)
-            self._flash_detection(y_pos, p['power'])
+            ocr_y = p['y_position']
+            y_pos = (int(ocr_y / ARENA_OCR_SCALE) if ocr_y else i * 100 + 50) + roi_y
+            is_available = self._availability_cache.get(p['power'])
+            if is_available is None:
+                if mask is None:
+                    mask = self.orange_mask(frame)
+                is_available = self.check_battle_available(frame, y_pos, mask)
+                self._availability_cache[p['power']] = is_available
+            ys.append(y_pos)
+            ps.append(p['power'])
+            raws.append(p.get('raw_text', ''))
+            avails.append(is_available)
+        
+        scroll = self.scroll_count
+        visible = [
+            {'power': pw, 'y_position': y, 'scroll_position': scroll, 'raw_text': raw, 'available': av}
+            for y, pw, raw, av in zip(ys, ps, raws, avails)
+        ]
+        
+        # Overlay flashes go out after detection (overlay is Qt, so they stay on this thread)
+        if visible:
+            self._begin_flash_batch()
+            try:
+                for y, pw in zip(ys, ps):
+                    self._flash_detection(y, pw)
+            finally:
+                self._end_flash_batch()
         
         # Compact log: scroll position, count, powers
         if visible:
@@ -262,6 +473,8 @@ class OpponentScanner:
             power_list = ', '.join(f"{o['power']:,}" for o in visible)
             self.log(f"    Scroll {self.scroll_count}: {len(visible)} found ({available} avail) - {power_list}")
         
+        self._last_roi_key = roi_key
+        self._last_visible = visible
         return visible
     
     def add_opponents_with_dedup(self, new_opponents):
@@ -271,23 +484,24 @@ class OpponentScanner:
         Returns:
             Number of new opponents added
         """
-        added_count = 0
-        new_powers = []
-        
+        # First sighting of each power in this batch, in scan order
+        incoming = {}
         for opp in new_opponents:
-            power = opp['power']
-            
-            if power not in self.known_powers:
-                self.known_powers.add(power)
-                self.opponents.append(opp)
-                added_count += 1
-                new_powers.append(f"{power:,}")
+            incoming.setdefault(opp['power'], opp)
+        
+        new_keys = incoming.keys() - self.known_powers
+        if not new_keys:
+            return 0
         
-        if added_count > 0:
-            self.max_scroll_reached = self.scroll_count
-            self.log(f"      + {added_count} new: {', '.join(new_powers)}")
+        added = [opp for power, opp in incoming.items() if power in new_keys]
+        self.known_powers |= new_keys
+        self.opponents.extend(added)
+        
+        self.max_scroll_reached = self.scroll_count
+        new_powers = ', '.join(f"{opp['power']:,}" for opp in added)
+        self.log(f"      + {len(added)} new: {new_powers}")
         
-        return added_count
+        return len(added)
     
     def run_full_scan(self):
         """
@@ -306,7 +520,31 @@ class OpponentScanner:
         self.log("  Scanning opponent list...")
         
         self.reset()
+        self.get_window_dimensions()  # Find the window before the worker starts capturing it
+        self._start_capture_worker()
+        try:
+            self._scan_list()
+        finally:
+            self._stop_capture_worker()
+        
+        # Hide the overlay now that scanning is complete
+        self._hide_overlay()
+        
+        # CRITICAL: Return to top of list for accurate position tracking
+        # The confirmation scroll logic can desync tracked vs actual position,
+        # so we scroll up MAX_SCROLL_ATTEMPTS times to guarantee we're at top
+        self.log(f"  Returning to top of list...")
+        self.scroll_list(direction='up', count=ARENA_MAX_SCROLL_ATTEMPTS)
+        # Now we're guaranteed to be at top, reset count
+        self.scroll_count = 0
+        
+        available_count = sum(1 for o in self.opponents if o.get('available', True))
+        self.log(f"  Scan complete: {len(self.opponents)} total, {available_count} available, max_scroll={self.max_scroll_reached}")
         
+        return self.opponents
+    
+    def _scan_list(self):
+        """Scroll through the list scanning each position (body of run_full_scan)"""
         # Step 1: Full scan at top (scroll_position = 0)
         self._show_overlay_mode('full')
         visible = self.scan_visible_opponents(use_bottom_band=False)
@@ -367,23 +605,6 @@ class OpponentScanner:
         # Ensure scroll_count doesn't go negative
         self.scroll_count = max(0, self.scroll_count)
         self.max_scroll_reached = self.scroll_count
-        
-        # Hide the overlay now that scanning is complete
-        self._hide_overlay()
-        
-        # CRITICAL: Return to top of list for accurate position tracking
-        # The confirmation scroll logic can desync tracked vs actual position,
-        # so we scroll up MAX_SCROLL_ATTEMPTS times to guarantee we're at top
-        self.log(f"  Returning to top of list...")
-        for _ in range(ARENA_MAX_SCROLL_ATTEMPTS):
-            self.scroll_list(direction='up')
-        # Now we're guaranteed to be at top, reset count
-        self.scroll_count = 0
-        
-        available_count = sum(1 for o in self.opponents if o.get('available', True))
-        self.log(f"  Scan complete: {len(self.opponents)} total, {available_count} available, max_scroll={self.max_scroll_reached}")
-        
-        return self.opponents
     
     def get_opponents_sorted_by_power(self, weakest_first=True):
         """Get opponents sorted by power"""
@@ -393,18 +614,46 @@ class OpponentScanner:
             reverse=not weakest_first
         )
     
-    def verify_opponent_at_position(self, target_power):
+    def _read_powers(self, frame):
         """
-        Verify a specific opponent is visible at current scroll position
+        OCR the full opponent region of a frame, reusing the result when the
+        same pixels were read recently (verify/find-Y calls often run back to
+        back on an unchanged screen).
         
+        Args:
+            frame: The captured screenshot (BGR format)
+            
         Returns:
-            True if opponent with target_power is visible, False otherwise
+            (powers, roi_y): find_all_team_powers results and the region's top Y
         """
-        frame = self.window_capture.capture()
         roi_x, roi_y, roi_w, roi_h = self.get_ocr_region(frame)
         roi_frame = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
         
-        powers = self.text_recognizer.find_all_team_powers(roi_frame)
+        key = (roi_x, roi_y, roi_frame.shape, hash(roi_frame.tobytes()))
+        powers = self._ocr_cache.get(key)
+        if powers is None:
+            powers = self.text_recognizer.find_all_team_powers(roi_frame)
+            self._ocr_cache[key] = powers
+            if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                self._ocr_cache.popitem(last=False)
+        else:
+            self._ocr_cache.move_to_end(key)
+        return powers, roi_y
+    
+    def verify_opponent_at_position(self, target_power, frame=None):
+        """
+        Verify a specific opponent is visible at current scroll position
+        
+        Args:
+            target_power: Power of the opponent to look for
+            frame: Already captured screenshot to read (captures one if None)
+        
+        Returns:
+            True if opponent with target_power is visible, False otherwise
+        """
+        if frame is None:
+            frame = self._capture()
+        powers, _ = self._read_powers(frame)
         
         for p in powers:
             if p['power'] == target_power:
@@ -412,18 +661,20 @@ class OpponentScanner:
         
         return False
     
-    def find_opponent_y_position(self, target_power):
+    def find_opponent_y_position(self, target_power, frame=None):
         """
         Find the Y position of an opponent with given power
         
+        Args:
+            target_power: Power of the opponent to look for
+            frame: Already captured screenshot to read (captures one if None)
+        
         Returns:
             Y position if found, None otherwise
         """
-        frame = self.window_capture.capture()
-        roi_x, roi_y, roi_w, roi_h = self.get_ocr_region(frame)
-        roi_frame = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
-        
-        powers = self.text_recognizer.find_all_team_powers(roi_frame)
+        if frame is None:
+            frame = self._capture()
+        powers, roi_y = self._read_powers(frame)
         
         for p in powers:
             if p['power'] == target_power:
@@ -431,17 +682,43 @@ class OpponentScanner:
         
         return None
     
-    def get_current_visible_powers(self):
+    def get_current_visible_powers(self, frame=None):
         """
         Quick scan to get currently visible powers (for verification)
         
+        Args:
+            frame: Already captured screenshot to read (waits for the screen
+                   to settle and captures one if None)
+        
         Returns:
             Set of power values currently visible
         """
-        time.sleep(ARENA_SCAN_DELAY)
-        frame = self.window_capture.capture()
-        roi_x, roi_y, roi_w, roi_h = self.get_ocr_region(frame)
-        roi_frame = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
-        
-        powers = self.text_recognizer.find_all_team_powers(roi_frame)
+        if frame is None:
+            time.sleep(ARENA_SCAN_DELAY)
+            frame = self._capture()
+        powers, _ = self._read_powers(frame)
         return set(p['power'] for p in powers)
+    
+    def get_first_visible_power(self):
+        """
+        Read only the top opponent row (cheaper than get_current_visible_powers)
+        
+        Returns:
+            Power of the first visible opponent, or None if it couldn't be read
+        """
+        time.sleep(ARENA_SCAN_DELAY)
+        _, _, width, height = self.get_window_dimensions()
+        roi_x = int(width * ARENA_OCR_REGION.x_start)
+        roi_y = int(height * ARENA_OCR_REGION.y_start)
+        roi_w = int(width * ARENA_OCR_REGION.width)
+        roi_h = int(height * ARENA_OCR_FIRST_ROW_HEIGHT)
+        
+        row = self.window_capture.capture_region(roi_y, roi_h)[:, roi_x:roi_x+roi_w]
+        # Binarize up front (Tesseract is faster on clean input); only one power is needed
+        gray = cv2.cvtColor(row, cv2.COLOR_BGR2GRAY)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        powers = self.text_recognizer.find_all_team_powers(binary, max_results=1)
+        if not powers:
+            # A binarized image skips the OCR fallback methods; give the raw row the full set
+            powers = self.text_recognizer.find_all_team_powers(row, max_results=1)
+        return powers[0]['power'] if powers else None
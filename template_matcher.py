@@ -1,16 +1,55 @@
+import os
 import time
 import cv2
-import pyautogui
+
+from config import TEMPLATE_SEARCH_ROIS
+
+# Template scales tried, in order
+TEMPLATE_SCALES = (1.0, 0.9, 1.1, 0.8, 1.2)
+
+# Half-resolution pre-check: skip a scale when the half-res score is this far
+# below the threshold, otherwise confirm at full res within PYRAMID_ROI_PAD px.
+# Each template is halved at all four (x, y) pixel phases, so one of them lines
+# up with the frame's 2x2 blocks wherever the button sits (odd offsets included)
+PYRAMID_MARGIN = 0.15
+PYRAMID_ROI_PAD = 8
+PYRAMID_MIN_TEMPLATE_SIZE = 8  # smallest half-res template side worth matching
+
+# Optional: run the half-res pass on the GPU when OpenCV was built with CUDA
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
+# matchTemplate/cvtColor are parallelized inside OpenCV; make sure the optimized
+# paths are on and leave one core for the game and the UI (global OpenCV state,
+# so set once on import rather than per TemplateMatcher)
+cv2.setUseOptimized(True)
+cv2.setNumThreads(max(1, (os.cpu_count() or 1) - 1))
 
 
 class TemplateMatcher:
     def __init__(self, window_capture):
         self.window_capture = window_capture
+        self._templates = {}  # template path -> (mtime, scaled grayscale variants), see _load_template
+        self._last_scale = {}  # template path -> index of the TEMPLATE_SCALES entry that last matched
+        
+        # CUDA state (unused without a CUDA device; dropped after the first GPU error)
+        self._use_gpu = CUDA_AVAILABLE
+        self._gpu_frame = None      # Reused GpuMat for the half-res frame
+        self._gpu_matcher = None    # cv2.cuda TM_CCOEFF_NORMED matcher
+        self._gpu_templates = {}    # id(half template) -> (template array, GpuMat)
     
-    def find_template(self, template_path, threshold=0.8):
+    def find_template(self, template_path, threshold=0.8, search_roi=None):
         """
         Find template image in window without clicking.
         
+        Args:
+            template_path: Template image
+            threshold: Match threshold
+            search_roi: Optional OCRRegion (percentages of the window) to search
+                first; defaults to the template's TEMPLATE_SEARCH_ROIS entry
+        
         Returns:
             (found, location, size) where:
             - found: True/False
@@ -19,32 +58,220 @@ class TemplateMatcher:
         """
         time.sleep(0.3)
         frame = self.window_capture.capture()
+        return self.find_in_frame(frame, template_path, threshold, search_roi)
+    
+    def _load_template(self, template_path):
+        """
+        Load a template once and keep its scaled grayscale variants.
+        Reloaded when the file's modification time changes (e.g. re-saved
+        through "Add Template").
         
+        Returns:
+            List of (scale, full, halves) grayscale templates, one per
+            TEMPLATE_SCALES entry, or None if the template file can't be read.
+            halves holds (dx, dy, half) for each pixel phase: full[dy:, dx:]
+            cropped to even size and halved (None when too small to match at
+            half resolution)
+        """
+        try:
+            mtime = os.path.getmtime(template_path)
+        except OSError:
+            return None
+        cached = self._templates.get(template_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         template = cv2.imread(template_path)
         if template is None:
-            return False, None, None
-        
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            return None
+        # Same BGR->gray conversion as the captured frames (IMREAD_GRAYSCALE rounds differently)
         gray_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        variants = []
+        for scale in TEMPLATE_SCALES:
+            # INTER_AREA for shrinking (no aliasing), INTER_CUBIC for enlarging
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+            scaled = cv2.resize(gray_template, None, fx=scale, fy=scale, interpolation=interpolation)
+            halves = None
+            if min(scaled.shape) > 2 * PYRAMID_MIN_TEMPLATE_SIZE:
+                halves = []
+                for dy in (0, 1):
+                    for dx in (0, 1):
+                        h, w = (scaled.shape[0] - dy) // 2, (scaled.shape[1] - dx) // 2
+                        phase = scaled[dy:dy + 2 * h, dx:dx + 2 * w]
+                        halves.append((dx, dy, cv2.resize(phase, (w, h), interpolation=cv2.INTER_AREA)))
+            variants.append((scale, scaled, halves))
+        self._templates[template_path] = (mtime, variants)
+        return variants
+    
+    def _upload_half_frame(self, half_frame):
+        """
+        Upload the half-res frame for GPU matching.
         
-        for scale in [1.0, 0.9, 1.1, 0.8, 1.2]:
-            scaled_template = cv2.resize(gray_template, None, fx=scale, fy=scale,
-                                        interpolation=cv2.INTER_CUBIC)
-            
-            if (scaled_template.shape[0] > gray_frame.shape[0] or
-                scaled_template.shape[1] > gray_frame.shape[1]):
+        Returns:
+            The reused GpuMat, or None to match on the CPU
+        """
+        if not self._use_gpu:
+            return None
+        try:
+            if self._gpu_frame is None:
+                self._gpu_frame = cv2.cuda_GpuMat()
+                self._gpu_matcher = cv2.cuda.createTemplateMatching(cv2.CV_8UC1, cv2.TM_CCOEFF_NORMED)
+            self._gpu_frame.upload(half_frame)
+            return self._gpu_frame
+        except cv2.error:
+            self._use_gpu = False
+            return None
+    
+    def _match_half(self, half_frame, gpu_half, half_template):
+        """
+        Half-res pass of _match_at_scale, on the GPU when gpu_half is set.
+        
+        Returns:
+            (best score, best location)
+        """
+        if gpu_half is not None:
+            try:
+                cached = self._gpu_templates.get(id(half_template))
+                if cached is None or cached[0] is not half_template:
+                    gpu_template = cv2.cuda_GpuMat()
+                    gpu_template.upload(half_template)
+                    cached = (half_template, gpu_template)
+                    self._gpu_templates[id(half_template)] = cached
+                result = self._gpu_matcher.match(gpu_half, cached[1])
+                _, half_val, _, half_loc = cv2.cuda.minMaxLoc(result)
+                return half_val, half_loc
+            except cv2.error:
+                self._use_gpu = False  # Fall back to the CPU from now on
+        result = cv2.matchTemplate(half_frame, half_template, cv2.TM_CCOEFF_NORMED)
+        _, half_val, _, half_loc = cv2.minMaxLoc(result)
+        return half_val, half_loc
+    
+    def _match_at_scale(self, gray_frame, half_frame, variant, threshold, gpu_half=None):
+        """
+        Match one scaled template variant against a grayscale frame
+        (gpu_half: the half-res frame already on the GPU, or None).
+        
+        The variant's four half-res phases are first matched on the
+        half-resolution frame; every phase scoring within PYRAMID_MARGIN of the
+        threshold is then confirmed at full resolution, in a small window
+        around its candidate (best half-res score first).
+        
+        Returns:
+            (confidence, scale, (x, y) center, (w, h) size), or None below threshold
+        """
+        scale, scaled_template, halves = variant
+        frame_h, frame_w = gray_frame.shape
+        h, w = scaled_template.shape
+        if h > frame_h or w > frame_w:
+            return None
+        
+        if halves is None:
+            # Too small for the pyramid: match the whole frame directly
+            return self._confirm(gray_frame, 0, 0, scaled_template, scale, threshold)
+        
+        # Full-res template origin of each phase's best half-res spot (phase
+        # (dx, dy) starts dx/dy pixels into the template)
+        candidates = []
+        for dx, dy, half_template in halves:
+            if (half_template.shape[0] > half_frame.shape[0] or
+                half_template.shape[1] > half_frame.shape[1]):
                 continue
-            
-            result = cv2.matchTemplate(gray_frame, scaled_template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            if max_val >= threshold:
-                h, w = scaled_template.shape
-                center_x = max_loc[0] + w // 2
-                center_y = max_loc[1] + h // 2
-                return True, (center_x, center_y), (w, h)
-        
-        return False, None, None
+            half_val, half_loc = self._match_half(half_frame, gpu_half, half_template)
+            if half_val >= threshold - PYRAMID_MARGIN:
+                candidates.append((half_val, half_loc[0] * 2 - dx, half_loc[1] * 2 - dy))
+        
+        # Confirm at full resolution around each candidate
+        for _, cx, cy in sorted(candidates, reverse=True):
+            x0 = max(0, cx - PYRAMID_ROI_PAD)
+            y0 = max(0, cy - PYRAMID_ROI_PAD)
+            x1 = min(frame_w, cx + w + PYRAMID_ROI_PAD)
+            y1 = min(frame_h, cy + h + PYRAMID_ROI_PAD)
+            if x1 - x0 < w or y1 - y0 < h:
+                continue
+            match = self._confirm(gray_frame[y0:y1, x0:x1], x0, y0, scaled_template, scale, threshold)
+            if match is not None:
+                return match
+        return None
+    
+    def _confirm(self, roi, x0, y0, scaled_template, scale, threshold):
+        """
+        Full-resolution match of a template inside roi (at x0, y0 in the frame).
+        
+        Returns:
+            Same as _match_at_scale
+        """
+        h, w = scaled_template.shape
+        result = cv2.matchTemplate(roi, scaled_template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        
+        if max_val >= threshold:
+            center = (x0 + max_loc[0] + w // 2, y0 + max_loc[1] + h // 2)
+            return max_val, scale, center, (w, h)
+        return None
+    
+    def _match_area(self, frame, template_path, variants, threshold):
+        """
+        Match cached template variants against a BGR frame, stopping at the
+        first scale that reaches threshold. The scale that matched last time
+        for this template is tried first (window geometry rarely changes),
+        then the rest in TEMPLATE_SCALES order.
+        
+        Returns:
+            (confidence, scale, (x, y) center, (w, h) size), or None
+        """
+        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Halve an even-sized crop so every half-res pixel is exactly one 2x2 block
+        height, width = gray_frame.shape
+        even = gray_frame[:height - height % 2, :width - width % 2]
+        half_frame = cv2.resize(even, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+        gpu_half = self._upload_half_frame(half_frame)
+        
+        first = self._last_scale.get(template_path, 0)
+        order = [first] + [i for i in range(len(variants)) if i != first]
+        for i in order:
+            match = self._match_at_scale(gray_frame, half_frame, variants[i], threshold, gpu_half)
+            if match is not None:
+                self._last_scale[template_path] = i
+                return match
+        return None
+    
+    def _match(self, frame, template_path, variants, threshold, search_roi=None):
+        """
+        Match a template, looking first in its search ROI (search_roi, or the
+        TEMPLATE_SEARCH_ROIS entry for template_path) and only falling back to
+        the whole frame when it isn't found there.
+        
+        Returns:
+            Same as _match_area, with the center relative to the full frame
+        """
+        roi = search_roi or TEMPLATE_SEARCH_ROIS.get(template_path)
+        if roi is not None:
+            height, width = frame.shape[:2]
+            x0 = int(width * roi.x_start)
+            y0 = int(height * roi.y_start)
+            area = frame[y0:y0 + int(height * roi.height), x0:x0 + int(width * roi.width)]
+            match = self._match_area(area, template_path, variants, threshold)
+            if match is not None:
+                confidence, scale, (x, y), size = match
+                return confidence, scale, (x0 + x, y0 + y), size
+        return self._match_area(frame, template_path, variants, threshold)
+    
+    def find_in_frame(self, frame, template_path, threshold=0.8, search_roi=None):
+        """
+        Find template image in an already captured frame (no capture, no click).
+        search_roi works as in find_template.
+        
+        Returns:
+            Same as find_template: (found, location, size)
+        """
+        variants = self._load_template(template_path)
+        if variants is None:
+            return False, None, None
+        
+        match = self._match(frame, template_path, variants, threshold, search_roi)
+        if match is None:
+            return False, None, None
+        _, _, location, size = match
+        return True, location, size
     
     def click_at_offset(self, base_x, base_y, offset_x=0, offset_y=0, wait_after=1.0):
         """
@@ -55,50 +282,34 @@ class TemplateMatcher:
         abs_x = left + base_x + offset_x
         abs_y = top + base_y + offset_y
         
+        import pyautogui  # Only needed to click; kept out of the startup imports
         pyautogui.moveTo(abs_x, abs_y, duration=0.3)
         time.sleep(0.2)
         pyautogui.click()
         time.sleep(wait_after)
 
-    def find_and_click(self, template_path, threshold=0.8, wait_after=3.0):
-        """Find template image in window and click it"""
+    def find_and_click(self, template_path, threshold=0.8, wait_after=3.0, search_roi=None):
+        """Find template image in window and click it (search_roi as in find_template)"""
         time.sleep(0.3)
         frame = self.window_capture.capture()
         
-        # Load template image
-        template = cv2.imread(template_path)
-        if template is None:
+        # Cached grayscale template variants (loaded from disk once)
+        variants = self._load_template(template_path)
+        if variants is None:
             return False, f'Template not found: {template_path}'
         
-        # Convert to grayscale
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        match = self._match(frame, template_path, variants, threshold, search_roi)
+        if match is None:
+            return False, 'Template not found in window'
+        max_val, scale, (x, y), _ = match
         
-        # Try multiple scales
-        for scale in [1.0, 0.9, 1.1, 0.8, 1.2]:
-            scaled_template = cv2.resize(gray_template, None, fx=scale, fy=scale, 
-                                        interpolation=cv2.INTER_CUBIC)
-            
-            if (scaled_template.shape[0] > gray_frame.shape[0] or 
-                scaled_template.shape[1] > gray_frame.shape[1]):
-                continue
-            
-            result = cv2.matchTemplate(gray_frame, scaled_template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            if max_val >= threshold:
-                h, w = scaled_template.shape
-                x = max_loc[0] + w // 2
-                y = max_loc[1] + h // 2
-                
-                left, top, _, _ = self.window_capture.window_info
-                abs_x = left + x
-                abs_y = top + y
-                
-                pyautogui.moveTo(abs_x, abs_y, duration=0.3)
-                time.sleep(0.2)
-                pyautogui.click()
-                time.sleep(wait_after)
-                return True, f'Found (confidence: {max_val:.2%}, scale: {scale:.1f}x)'
-        
-        return False, 'Template not found in window'
+        left, top, _, _ = self.window_capture.window_info
+        abs_x = left + x
+        abs_y = top + y
+        
+        import pyautogui  # Only needed to click; kept out of the startup imports
+        pyautogui.moveTo(abs_x, abs_y, duration=0.3)
+        time.sleep(0.2)
+        pyautogui.click()
+        time.sleep(wait_after)
+        return True, f'Found (confidence: {max_val:.2%}, scale: {scale:.1f}x)'
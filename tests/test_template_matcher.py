@@ -0,0 +1,97 @@
+"""
+Template matcher checks against the shipped templates.
+
+Run from the repo root: python -m unittest discover tests
+"""
+
+import glob
+import os
+import sys
+import unittest
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import TEMPLATE_SEARCH_ROIS
+from template_matcher import TemplateMatcher
+
+TEMPLATES = sorted(glob.glob(os.path.join(ROOT, 'templates', '*.png')))
+FRAME_SIZE = (703, 1734)  # Typical Raid client area (h, w)
+
+
+def _noise_frame(rng):
+    return rng.integers(0, 40, FRAME_SIZE + (3,), dtype=np.uint8)
+
+
+class TestPyramidParity(unittest.TestCase):
+    """A template pasted pixel-perfect must be found at every (x, y) parity."""
+    
+    def setUp(self):
+        self.matcher = TemplateMatcher(None)
+        self.rng = np.random.default_rng(0)
+    
+    def test_match_area_all_parities(self):
+        self.assertTrue(TEMPLATES, "no templates found")
+        for path in TEMPLATES:
+            template = cv2.imread(path)
+            h, w = template.shape[:2]
+            variants = self.matcher._load_template(path)
+            for dy in (0, 1):
+                for dx in (0, 1):
+                    x, y = 600 + dx, 300 + dy
+                    frame = _noise_frame(self.rng)
+                    frame[y:y + h, x:x + w] = template
+                    for threshold in (0.8, 0.98):
+                        with self.subTest(template=os.path.basename(path), dx=dx, dy=dy,
+                                          threshold=threshold):
+                            match = self.matcher._match_area(frame, path, variants, threshold)
+                            self.assertIsNotNone(match)
+                            self.assertEqual(match[2], (x + w // 2, y + h // 2))
+
+    def test_find_in_frame_all_parities(self):
+        """Shared path behind find_and_click: search ROI first, then full frame."""
+        frame_h, frame_w = FRAME_SIZE
+        for path in TEMPLATES:
+            template = cv2.imread(path)
+            h, w = template.shape[:2]
+            roi = TEMPLATE_SEARCH_ROIS.get(path)
+            if roi is not None:
+                # Inside the template's search ROI
+                base_x = int(frame_w * roi.x_start) + 11
+                base_y = int(frame_h * roi.y_start) + 5
+            else:
+                base_x, base_y = 600, 300
+            for dy in (0, 1):
+                for dx in (0, 1):
+                    x, y = base_x + dx, base_y + dy
+                    frame = _noise_frame(self.rng)
+                    frame[y:y + h, x:x + w] = template
+                    for threshold in (0.8, 0.98):
+                        with self.subTest(template=os.path.basename(path), dx=dx, dy=dy,
+                                          threshold=threshold):
+                            found, location, _ = self.matcher.find_in_frame(frame, path, threshold)
+                            self.assertTrue(found)
+                            self.assertEqual(location, (x + w // 2, y + h // 2))
+    
+    def test_cached_button_band(self):
+        """The small band BattleSequence._click_cached_button re-matches."""
+        for path in TEMPLATES:
+            template = cv2.imread(path)
+            h, w = template.shape[:2]
+            for dy in (0, 1):
+                for dx in (0, 1):
+                    # Band of 2h rows starting h/2 above the button, 2w columns wide
+                    band = _noise_frame(self.rng)[:2 * h, :2 * w]
+                    x, y = w // 2 + dx, h // 2 + dy
+                    band[y:y + h, x:x + w] = template
+                    with self.subTest(template=os.path.basename(path), dx=dx, dy=dy):
+                        found, location, _ = self.matcher.find_in_frame(band, path, 0.9)
+                        self.assertTrue(found)
+                        self.assertEqual(location, (x + w // 2, y + h // 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
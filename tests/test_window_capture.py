@@ -0,0 +1,98 @@
+"""
+WindowCapture camera handling, with bettercam replaced by a fake.
+
+Run from the repo root: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import window_capture
+from window_capture import WindowCapture
+
+
+class FakeCamera:
+    """Per-output camera like bettercam's: one instance, cropped to the region it was started with"""
+    
+    def __init__(self):
+        self.region = None
+        self.running = False
+        self.released = False
+    
+    def start(self, region=None, target_fps=60, video_mode=False):
+        assert not self.running, "camera already running"
+        if region is not None:
+            self.region = region
+        self.running = True
+    
+    def stop(self):
+        self.running = False
+    
+    def release(self):
+        self.stop()
+        self.released = True
+    
+    def get_latest_frame(self):
+        left, top, right, bottom = self.region
+        return np.zeros((bottom - top, right - left, 3), dtype=np.uint8)
+
+
+class FakeBettercam:
+    """bettercam.create returns the cached camera of the output on every call"""
+    
+    def __init__(self):
+        self.camera = None
+    
+    def create(self, output_idx=0, region=None, output_color='RGB'):
+        if self.camera is None:
+            # Only the first create sets the region; later calls ignore it
+            self.camera = FakeCamera()
+            self.camera.region = region
+        return self.camera
+
+
+class TestCameraRegion(unittest.TestCase):
+    
+    def setUp(self):
+        self.bettercam = FakeBettercam()
+        patcher = mock.patch.object(window_capture, 'bettercam', self.bettercam)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.capture = WindowCapture('Raid: Shadow Legends')
+    
+    def test_move_and_resize_rebuild_the_region(self):
+        for window_info in ((100, 50, 1734, 703), (300, 80, 1734, 703), (300, 80, 1280, 600)):
+            self.capture.window_info = window_info
+            left, top, width, height = window_info
+            frame = self.capture.capture()
+            camera = self.bettercam.camera
+            self.assertEqual(camera.region, (left, top, left + width, top + height))
+            self.assertTrue(camera.running)
+            self.assertEqual(frame.shape, (height, width, 3))
+            band = self.capture.capture_region(10, 20)
+            self.assertEqual(band.shape, (20, width, 3))
+    
+    def test_unchanged_window_keeps_the_camera(self):
+        self.capture.window_info = (100, 50, 1734, 703)
+        self.capture.capture()
+        with mock.patch.object(self.bettercam.camera, 'start') as start:
+            self.capture.capture()
+            start.assert_not_called()
+    
+    def test_close_releases_the_camera(self):
+        self.capture.window_info = (100, 50, 1734, 703)
+        self.capture.capture()
+        self.capture.close()
+        self.assertTrue(self.bettercam.camera.released)
+        self.assertIsNone(self.capture._cam)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,13 @@
 """
 Text Recognition Module for Dreamer
-Uses pytesseract OCR to read text from game screenshots
+Uses Tesseract OCR (tesserocr or pytesseract) to read text from game screenshots
 """
 
+import bisect
 import cv2
 import numpy as np
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import pytesseract
@@ -13,6 +15,49 @@ except ImportError:
     pytesseract = None
     print("Warning: pytesseract not installed. Text recognition will not work.")
 
+# Optional: tesserocr keeps one Tesseract engine loaded in-process, instead of
+# pytesseract starting the tesseract executable (and reloading eng.traineddata) per call
+try:
+    import tesserocr
+    from PIL import Image
+except ImportError:
+    tesserocr = None
+
+# Page segmentation mode in a Tesseract config string, e.g. '--psm 6'
+PSM_PATTERN = re.compile(r'--psm\s+(\d+)')
+DEFAULT_PSM = 3  # Tesseract's own default (fully automatic)
+
+# Preprocessing methods tried in order until one reads any text
+OCR_METHODS = ('default', 'threshold', 'clahe')
+
+
+# parse_team_power: tried in order on comma/period-stripped text
+TEAM_POWER_PATTERNS = (
+    re.compile(r'Team\s*Power[:\s]*(\d+)', re.IGNORECASE),
+    re.compile(r'Power[:\s]*(\d+)', re.IGNORECASE),
+    re.compile(r'(\d{4,6})'),  # 4-6 digit numbers (team power range)
+)
+
+# find_all_team_powers: "Team Power: 8,309" as OCR tends to read it
+# Allow periods in numbers since OCR sometimes reads commas as periods (e.g., "8.309" instead of "8,309")
+# Make pattern very flexible - OCR often garbles "Team Power:"
+# Match: "Team Power:", "am Power:", "Power:", "Power.", "Power " followed by number
+TEAM_POWER_LINE_PATTERN = re.compile(r'(?:[Tt]?e?a?m?\s*)?[Pp]ower[:\.\s]+(\d[\d,\.]+)', re.IGNORECASE)
+
+# Deletes thousands separators (OCR reads the comma as a period at times) in one pass
+STRIP_SEPARATORS = str.maketrans('', '', ',.')
+
+# Standalone 4-6 digit number (typical team power range: 1,000 - 999,999)
+POWER_NUMBER_PATTERN = re.compile(r'^\d{4,6}$')
+
+
+def _is_binarized(image):
+    """True for a single-channel image with only pure black and white pixels"""
+    if image.ndim != 2:
+        return False
+    hist = cv2.calcHist([image], [0], None, [256], [0, 256])
+    return not hist[1:255].any()
+
 
 class TextRecognizer:
     def __init__(self, window_capture, log_func=None, debug=True):
@@ -20,15 +65,148 @@ class TextRecognizer:
         self.log = log_func or print
         self.debug = debug  # Enable verbose logging
         
-        if pytesseract is None:
+        # In-process engine when tesserocr is installed and finds its language data
+        self._api = None
+        if tesserocr is not None:
+            try:
+                self._api = tesserocr.PyTessBaseAPI()
+            except RuntimeError as e:
+                self.log(f"[TextRecognizer] tesserocr unavailable ({e}), using pytesseract")
+        
+        if self._api is None and pytesseract is None:
             raise ImportError("pytesseract is required for text recognition. Install with: pip install pytesseract")
         
+        # pytesseract runs each call in its own tesseract process, so fallback
+        # methods can run side by side (the single tesserocr engine can't)
+        self._pool = ThreadPoolExecutor(max_workers=len(OCR_METHODS) - 1) if self._api is None else None
+        
+        # Preprocessing: one CLAHE estimator, and one flat buffer (grown to the
+        # largest image seen) that every 2x upscale is written into
+        self._clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+        self._up_buf = np.empty(0, dtype=np.uint8)
+        
         self.log("[TextRecognizer] Initialized")
     
-    def _debug_log(self, message):
-        """Log only if debug mode is enabled"""
+    def __del__(self):
+        """Release the tesserocr engine and the fallback OCR threads"""
+        api = getattr(self, '_api', None)
+        if api is not None:
+            api.End()
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+    
+    def _ocr_each_method(self, image, ocr, config):
+        """
+        OCR the image once per OCR_METHODS preprocessing, yielding results in
+        method order so the caller can stop at the first usable one.
+        The first method runs alone (it usually succeeds); if the caller asks
+        for more, the remaining methods are started together on the pool.
+        
+        Args:
+            image: BGR or grayscale image
+            ocr: self._ocr_string or self._ocr_data
+            config: Tesseract config string
+            
+        Yields:
+            (method, OCR result)
+        """
+        first, rest = OCR_METHODS[0], OCR_METHODS[1:]
+        self._debug_log("Trying preprocessing method: %s", first)
+        yield first, ocr(self.preprocess_for_ocr(image, first), config)
+        
+        if _is_binarized(image):
+            # Thresholding or equalizing a black/white image gives Tesseract nothing new
+            self._debug_log("Input already binarized, skipping %s", ', '.join(rest))
+            return
+        
+        if self._pool is None:
+            for method in rest:
+                self._debug_log("Trying preprocessing method: %s", method)
+                yield method, ocr(self.preprocess_for_ocr(image, method), config)
+            return
+        
+        self._debug_log("Trying preprocessing methods in parallel: %s", ', '.join(rest))
+        futures = [(method, self._pool.submit(ocr, self.preprocess_for_ocr(image, method), config)) for method in rest]
+        try:
+            for method, future in futures:
+                yield method, future.result()
+        finally:
+            for _, future in futures:
+                future.cancel()
+    
+    def _set_api_image(self, image, config):
+        """Load a grayscale image and the config's page segmentation mode into the tesserocr engine"""
+        match = PSM_PATTERN.search(config)
+        self._api.SetPageSegMode(int(match.group(1)) if match else DEFAULT_PSM)
+        self._api.SetImage(Image.fromarray(image))
+    
+    def _ocr_string(self, image, config):
+        """image_to_string equivalent (tesserocr when available, else pytesseract)"""
+        if self._api is None:
+            return pytesseract.image_to_string(image, config=config)
+        self._set_api_image(image, config)
+        return self._api.GetUTF8Text()
+    
+    def _ocr_data(self, image, config):
+        """
+        image_to_data equivalent (tesserocr when available, else pytesseract)
+        
+        Returns:
+            Dict of parallel lists: 'text', 'conf', 'left', 'top', 'width',
+            'height', 'block_num', 'par_num', 'line_num'
+        """
+        if self._api is None:
+            return pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+        
+        self._set_api_image(image, config)
+        self._api.Recognize()
+        
+        data = {key: [] for key in ('text', 'conf', 'left', 'top', 'width', 'height', 'block_num', 'par_num', 'line_num')}
+        words = self._api.GetIterator()
+        if words is None:  # Nothing recognized
+            return data
+        block = par = line = 0
+        word_level = tesserocr.RIL.WORD
+        for word in tesserocr.iterate_level(words, word_level):
+            # Number blocks/paragraphs/lines the way image_to_data does
+            if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                block, par, line = block + 1, 0, 0
+            if word.IsAtBeginningOf(tesserocr.RIL.PARA):
+                par, line = par + 1, 0
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line += 1
+            box = word.BoundingBox(word_level)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            data['text'].append(word.GetUTF8Text(word_level) or '')
+            data['conf'].append(int(word.Confidence(word_level)))
+            data['left'].append(x1)
+            data['top'].append(y1)
+            data['width'].append(x2 - x1)
+            data['height'].append(y2 - y1)
+            data['block_num'].append(block)
+            data['par_num'].append(par)
+            data['line_num'].append(line)
+        return data
+    
+    def _debug_log(self, message, *args):
+        """Log only if debug mode is enabled (message is %-formatted with args only then)"""
         if self.debug:
-            self.log(f"  [OCR] {message}")
+            self.log("  [OCR] " + (message % args if args else message))
+    
+    def _upscale_2x(self, gray):
+        """
+        2x INTER_CUBIC upscale into the shared buffer. Only use the result as an
+        intermediate - the next upscale overwrites it.
+        """
+        height, width = gray.shape[:2]
+        size = 4 * height * width
+        if self._up_buf.size < size:
+            self._up_buf = np.empty(size, dtype=np.uint8)
+        out = self._up_buf[:size].reshape(2 * height, 2 * width)
+        return cv2.resize(gray, (2 * width, 2 * height), dst=out, interpolation=cv2.INTER_CUBIC)
     
     def preprocess_for_ocr(self, image, method='default'):
         """Preprocess image to improve OCR accuracy"""
@@ -36,7 +214,7 @@ class TextRecognizer:
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
-            gray = image.copy()
+            gray = image  # Never modified in place below; every method returns a new image or this one as-is
         
         if method == 'default':
             # No scaling - use original resolution for cleaner OCR
@@ -44,28 +222,27 @@ class TextRecognizer:
             
         elif method == 'threshold':
             # Binary threshold for light text on dark background
-            upscaled = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+            upscaled = self._upscale_2x(gray)
             _, thresh = cv2.threshold(upscaled, 150, 255, cv2.THRESH_BINARY)
             return thresh
             
         elif method == 'adaptive':
             # Adaptive threshold
-            upscaled = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+            upscaled = self._upscale_2x(gray)
             thresh = cv2.adaptiveThreshold(upscaled, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
                                           cv2.THRESH_BINARY, 11, 2)
             return thresh
             
         elif method == 'inverted':
             # Invert for dark text on light background
-            upscaled = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+            upscaled = self._upscale_2x(gray)
             inverted = cv2.bitwise_not(upscaled)
             return inverted
             
         elif method == 'clahe':
             # Contrast Limited Adaptive Histogram Equalization
-            upscaled = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(upscaled)
+            upscaled = self._upscale_2x(gray)
+            enhanced = self._clahe.apply(upscaled)
             return enhanced
         
         return gray
@@ -82,27 +259,23 @@ class TextRecognizer:
         Returns:
             Extracted text string
         """
-        self._debug_log(f"extract_text called with config='{config}'")
+        self._debug_log("extract_text called with config='%s'", config)
         
         if region:
             x, y, w, h = region
-            self._debug_log(f"Cropping to region: x={x}, y={y}, w={w}, h={h}")
+            self._debug_log("Cropping to region: x=%s, y=%s, w=%s, h=%s", x, y, w, h)
             image = image[y:y+h, x:x+w]
         
-        self._debug_log(f"Image shape: {image.shape}")
+        self._debug_log("Image shape: %s", image.shape)
         
         # Try multiple preprocessing methods
-        methods = ['default', 'threshold', 'clahe']
-        
-        for method in methods:
-            self._debug_log(f"Trying preprocessing method: {method}")
-            processed = self.preprocess_for_ocr(image, method)
-            text = pytesseract.image_to_string(processed, config=config)
-            if text.strip():
-                self._debug_log(f"SUCCESS with {method}: '{text.strip()[:100]}...'" if len(text.strip()) > 100 else f"SUCCESS with {method}: '{text.strip()}'")
-                return text.strip()
+        for method, text in self._ocr_each_method(image, self._ocr_string, config):
+            text = text.strip()
+            if text:
+                self._debug_log("SUCCESS with %s: '%s%s'", method, text[:100], '...' if len(text) > 100 else '')
+                return text
             else:
-                self._debug_log(f"No text found with {method}")
+                self._debug_log("No text found with %s", method)
         
         self._debug_log("No text extracted from any method")
         return ""
@@ -123,44 +296,112 @@ class TextRecognizer:
         processed = self.preprocess_for_ocr(image, 'default')
         scale_factor = 1  # No scaling in default preprocessing
         
-        data = pytesseract.image_to_data(processed, config=config, output_type=pytesseract.Output.DICT)
+        data = self._ocr_data(processed, config)
         
         results = []
-        for i, text in enumerate(data['text']):
-            if text.strip() and int(data['conf'][i]) > 0:
+        for text, conf, left, top, width, height in zip(
+                data['text'], data['conf'], data['left'], data['top'], data['width'], data['height']):
+            text = text.strip()
+            if not text:
+                continue
+            conf = int(conf)
+            if conf > 0:
                 results.append({
-                    'text': text.strip(),
-                    'x': x_offset + data['left'][i] // scale_factor,
-                    'y': y_offset + data['top'][i] // scale_factor,
-                    'w': data['width'][i] // scale_factor,
-                    'h': data['height'][i] // scale_factor,
-                    'confidence': int(data['conf'][i])
+                    'text': text,
+                    'x': x_offset + left // scale_factor,
+                    'y': y_offset + top // scale_factor,
+                    'w': width // scale_factor,
+                    'h': height // scale_factor,
+                    'confidence': conf
                 })
         
         return results
     
-    def find_text(self, image, search_text, case_sensitive=False):
+    def extract_text_and_positions(self, image, config='--psm 6'):
         """
-        Find specific text in image and return its position
+        Extract the text and the word boxes of an image with one Tesseract run
+        per preprocessing method (stops at the first method that reads anything)
         
+        Args:
+            image: BGR or grayscale image
+            config: Tesseract config string
+            
         Returns:
-            (x, y, w, h) of found text or None
+            (text, results) where text is rebuilt line by line like extract_text
+            and results are dicts like extract_text_with_positions returns
         """
-        results = self.extract_text_with_positions(image)
-        
-        for result in results:
-            text = result['text']
-            target = search_text
+        for method, data in self._ocr_each_method(image, self._ocr_data, config):
+            # Upscaled methods report boxes at 2x; scale them back to image coordinates
+            scale_factor = 1 if method == 'default' else 2
             
-            if not case_sensitive:
-                text = text.lower()
-                target = target.lower()
+            lines = {}  # (block, paragraph, line) -> words, in reading order
+            results = []
+            for text, conf, left, top, width, height, block, par, line in zip(
+                    data['text'], data['conf'], data['left'], data['top'], data['width'], data['height'],
+                    data['block_num'], data['par_num'], data['line_num']):
+                text = text.strip()
+                if not text:
+                    continue
+                lines.setdefault((block, par, line), []).append(text)
+                conf = int(conf)
+                if conf > 0:
+                    results.append({
+                        'text': text,
+                        'x': left // scale_factor,
+                        'y': top // scale_factor,
+                        'w': width // scale_factor,
+                        'h': height // scale_factor,
+                        'confidence': conf
+                    })
             
+            if lines:
+                full_text = '\n'.join(' '.join(words) for words in lines.values())
+                self._debug_log("SUCCESS with %s: '%s%s'", method, full_text[:100], '...' if len(full_text) > 100 else '')
+                return full_text, results
+            self._debug_log("No text found with %s", method)
+        
+        self._debug_log("No text extracted from any method")
+        return "", []
+    
+    def build_text_index(self, image):
+        """
+        OCR an image once for any number of find_text_in_index searches
+        
+        Returns:
+            extract_text_with_positions results, each with a lowercased 'lower' text
+        """
+        results = self.extract_text_with_positions(image)
+        for result in results:
+            result['lower'] = result['text'].lower()
+        return results
+    
+    def find_text_in_index(self, index, search_text, case_sensitive=False):
+        """
+        Find specific text in a build_text_index result
+        
+        Returns:
+            (x, y, w, h) of found text or None
+        """
+        key = 'text' if case_sensitive else 'lower'
+        target = search_text if case_sensitive else search_text.lower()
+        
+        for result in index:
+            text = result[key]
             if target in text or text in target:
                 return (result['x'], result['y'], result['w'], result['h'])
         
         return None
     
+    def find_text(self, image, search_text, case_sensitive=False):
+        """
+        Find specific text in image and return its position
+        (to search one image for several texts, use build_text_index once)
+        
+        Returns:
+            (x, y, w, h) of found text or None
+        """
+        return self.find_text_in_index(self.build_text_index(image), search_text, case_sensitive)
+    
     def parse_team_power(self, text):
         """
         Parse team power from text like "Team Power: 8,309" or "14,508"
@@ -169,17 +410,11 @@ class TextRecognizer:
             Integer power value or None
         """
         # Remove commas and look for number patterns
-        text = text.replace(',', '').replace('.', '')
+        text = text.translate(STRIP_SEPARATORS)
         
         # Pattern for "Team Power: XXXXX" or just numbers
-        patterns = [
-            r'Team\s*Power[:\s]*(\d+)',
-            r'Power[:\s]*(\d+)',
-            r'(\d{4,6})',  # 4-6 digit numbers (team power range)
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in TEAM_POWER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 try:
                     return int(match.group(1))
@@ -188,29 +423,24 @@ class TextRecognizer:
         
         return None
     
-    def find_all_team_powers(self, image):
+    def find_all_team_powers(self, image, max_results=None):
         """
         Find all team power values in the image with their positions
         
+        Args:
+            image: BGR or grayscale image
+            max_results: Stop once this many powers are found (None = find all)
+        
         Returns:
             List of dicts with 'power' (int) and 'y_position' (int)
         """
-        # Get positioned text data (for Y position lookup)
-        results = self.extract_text_with_positions(image, config='--psm 11')
+        # One OCR pass gives both the text to match and the word positions (for Y lookup)
+        full_text, results = self.extract_text_and_positions(image, config='--psm 6')
         
         powers = []
         
-        # Look for "Team Power:" followed by a number
-        # Build text blocks by grouping nearby text
-        full_text = self.extract_text(image, config='--psm 6')
-        
         # Find all occurrences of team power pattern
-        # Allow periods in numbers since OCR sometimes reads commas as periods (e.g., "8.309" instead of "8,309")
-        # Make pattern very flexible - OCR often garbles "Team Power:"
-        # Match: "Team Power:", "am Power:", "Power:", "Power.", "Power " followed by number
-        pattern = r'(?:[Tt]?e?a?m?\s*)?[Pp]ower[:\.\s]+(\d[\d,\.]+)'
-        
-        matches_found = list(re.finditer(pattern, full_text, re.IGNORECASE))
+        matches_found = list(TEAM_POWER_LINE_PATTERN.finditer(full_text))
         
         # Track which Y positions we've already used
         used_y_positions = set()
@@ -220,7 +450,7 @@ class TextRecognizer:
         
         for match in matches_found:
             # Replace both commas and periods, then parse as int
-            power_str = match.group(1).replace(',', '').replace('.', '')
+            power_str = match.group(1).translate(STRIP_SEPARATORS)
             try:
                 power = int(power_str)
                 
@@ -234,12 +464,12 @@ class TextRecognizer:
                 
                 # Method 1: Look for the exact power value in text
                 for result in results:
-                    result_text = result['text'].replace(',', '').replace('.', '')
+                    result_text = result['text'].translate(STRIP_SEPARATORS)
                     if power_str in result_text:
                         candidate_y = result['y']
                         if candidate_y not in used_y_positions:
                             y_pos = candidate_y
-                            self._debug_log(f"Found Y={y_pos} from exact match '{result['text']}'")
+                            self._debug_log("Found Y=%s from exact match '%s'", y_pos, result['text'])
                             break
                 
                 # Method 2: Look for "Power" text at unused Y positions
@@ -249,14 +479,14 @@ class TextRecognizer:
                         candidate_y = result['y']
                         if candidate_y not in used_y_positions:
                             y_pos = candidate_y
-                            self._debug_log(f"Found Y={y_pos} from 'Power' text '{result['text']}'")
+                            self._debug_log("Found Y=%s from 'Power' text '%s'", y_pos, result['text'])
                             break
                 
                 # Method 3: Estimate Y based on order (assume ~115px spacing between opponents)
                 if y_pos is None:
                     estimated_y = len(powers) * 115 + 50
                     y_pos = estimated_y
-                    self._debug_log(f"Estimated Y={y_pos} based on order")
+                    self._debug_log("Estimated Y=%s based on order", y_pos)
                 
                 if y_pos is not None:
                     used_y_positions.add(y_pos)
@@ -267,30 +497,39 @@ class TextRecognizer:
                     'y_position': y_pos,
                     'raw_text': match.group(0)
                 })
+                if max_results is not None and len(powers) >= max_results:
+                    return powers
             except ValueError:
                 continue
         
+        # Used Y positions in order, so the nearness check below only looks at two neighbors
+        sorted_used_y = sorted(used_y_positions)
+        
         # FALLBACK: Scan positioned text elements for standalone numbers that look like power values
         # This catches cases where OCR garbles "Team Power:" but correctly reads the number
         for result in results:
-            text = result['text'].replace(',', '').replace('.', '')
+            text = result['text'].translate(STRIP_SEPARATORS)
             # Look for 4-6 digit numbers (typical team power range: 1,000 - 999,999)
-            if re.match(r'^\d{4,6}$', text):
+            if POWER_NUMBER_PATTERN.match(text):
                 try:
                     power = int(text)
                     # Valid power range and not already found
                     if 1000 <= power <= 999999 and power not in found_powers:
                         y_pos = result['y']
                         # Check we haven't used a nearby Y position (within 20px)
-                        too_close = any(abs(y_pos - used_y) < 20 for used_y in used_y_positions)
+                        i = bisect.bisect_left(sorted_used_y, y_pos)
+                        too_close = ((i > 0 and y_pos - sorted_used_y[i - 1] < 20) or
+                                     (i < len(sorted_used_y) and sorted_used_y[i] - y_pos < 20))
                         if not too_close:
                             found_powers.add(power)
-                            used_y_positions.add(y_pos)
+                            bisect.insort(sorted_used_y, y_pos)
                             powers.append({
                                 'power': power,
                                 'y_position': y_pos,
                                 'raw_text': f'[fallback] {result["text"]}'
                             })
+                            if max_results is not None and len(powers) >= max_results:
+                                return powers
                 except ValueError:
                     continue
         
@@ -307,6 +546,7 @@ class OpponentScanner:
         self.text_recognizer = text_recognizer
         self.log = log_func or print
         self.opponents = []
+        self._power_index = set()  # Powers already in self.opponents
         self.scroll_position = 0  # Track scroll state
     
     def scan_visible_opponents(self, frame=None):
@@ -395,16 +635,11 @@ class OpponentScanner:
         Uses power + approximate position to identify duplicates
         """
         for new_opp in new_opponents:
-            is_duplicate = False
-            
-            for existing in self.opponents:
-                # Consider it a duplicate if same power and similar scroll position
-                if existing['power'] == new_opp['power']:
-                    # Could be same opponent - check if positions are close
-                    is_duplicate = True
-                    break
+            # Consider it a duplicate if an opponent with the same power is already listed
+            is_duplicate = new_opp['power'] in self._power_index
             
             if not is_duplicate:
+                self._power_index.add(new_opp['power'])
                 self.opponents.append(new_opp)
                 self.log(f"  Added new opponent: Power={new_opp['power']:,}")
             else:
@@ -422,4 +657,5 @@ class OpponentScanner:
     def clear(self):
         """Clear the opponent list"""
         self.opponents = []
+        self._power_index = set()
         self.scroll_position = 0
@@ -1,19 +1,56 @@
 import os
+import sys
+import time
 from PyQt5.QtWidgets import QMessageBox, QApplication
 from PyQt5.QtGui import QPixmap, QImage
 from PyQt5.QtCore import Qt
 
 import numpy as np
 
+# pyautogui is only needed by the non-Windows fallbacks below; it is imported
+# there so loading utils at startup doesn't pull it in
+# Windows-specific imports for instant clicks via SendInput
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+    
+    # Windows constants
+    INPUT_MOUSE = 0
+    MOUSEEVENTF_LEFTDOWN = 0x0002
+    MOUSEEVENTF_LEFTUP = 0x0004
+    VK_ESCAPE = 0x1B
+    KEYEVENTF_KEYUP = 0x0002
+    
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [('dx', wintypes.LONG), ('dy', wintypes.LONG), ('mouseData', wintypes.DWORD),
+                    ('dwFlags', wintypes.DWORD), ('time', wintypes.DWORD), ('dwExtraInfo', ctypes.c_size_t)]
+    
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [('mi', _MOUSEINPUT)]  # Largest INPUT member, so the union is full size
+    
+    class _INPUT(ctypes.Structure):
+        _fields_ = [('type', wintypes.DWORD), ('u', _INPUTUNION)]
+    
+    user32 = ctypes.windll.user32
+    user32.SetCursorPos.argtypes = [ctypes.c_int, ctypes.c_int]
+    user32.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int]
+    user32.SendInput.restype = wintypes.UINT
+    
+    _LEFT_CLICK = (_INPUT * 2)(
+        _INPUT(INPUT_MOUSE, _INPUTUNION(mi=_MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTDOWN, 0, 0))),
+        _INPUT(INPUT_MOUSE, _INPUTUNION(mi=_MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTUP, 0, 0))),
+    )
+
 def log_message(widget, message):
-    widget.log_output.append(message)
+    widget.log_output.appendPlainText(message)
     QApplication.processEvents()
 
 def show_preview(image_label, frame):
     height, width, channel = frame.shape
     bytes_per_line = 3 * width
-    frame_contiguous = np.ascontiguousarray(frame)
-    q_img = QImage(frame_contiguous.data.tobytes(), width, height, bytes_per_line, QImage.Format_BGR888)
+    # QImage wraps the array's memory (no copy); QPixmap.fromImage copies it before frame can go away
+    frame = np.ascontiguousarray(frame)
+    q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format_BGR888)
     pixmap = QPixmap.fromImage(q_img)
     image_label.setPixmap(pixmap.scaled(image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
@@ -22,3 +59,50 @@ def show_error(parent, message):
 
 def show_info(parent, message):
     QMessageBox.information(parent, 'Info', message)
+
+def click_at(x, y):
+    """Left-click at screen (x, y) without pyautogui's move animation or pause"""
+    if sys.platform == 'win32':
+        user32.SetCursorPos(int(x), int(y))
+        user32.SendInput(2, _LEFT_CLICK, ctypes.sizeof(_INPUT))
+    else:
+        import pyautogui
+        pyautogui.click(int(x), int(y))
+
+def drag_vertical(x, start_y, end_y, duration, hold=0.0, steps=20):
+    """
+    Left-drag from (x, start_y) to (x, end_y) without pyautogui's per-call pause.
+    
+    Args:
+        x: Screen X of the drag
+        start_y: Screen Y where the button goes down
+        end_y: Screen Y where the drag ends
+        duration: Seconds spent moving from start_y to end_y
+        hold: Seconds to keep the button down at end_y before releasing
+        steps: Number of intermediate cursor moves
+    """
+    x, start_y, end_y = int(x), int(start_y), int(end_y)
+    if sys.platform == 'win32':
+        user32.SetCursorPos(x, start_y)
+        user32.SendInput(1, ctypes.byref(_LEFT_CLICK[0]), ctypes.sizeof(_INPUT))
+        for i in range(1, steps + 1):
+            time.sleep(duration / steps)
+            user32.SetCursorPos(x, start_y + (end_y - start_y) * i // steps)
+        time.sleep(hold)
+        user32.SendInput(1, ctypes.byref(_LEFT_CLICK[1]), ctypes.sizeof(_INPUT))
+    else:
+        import pyautogui
+        pyautogui.moveTo(x, start_y, _pause=False)
+        pyautogui.mouseDown(_pause=False)
+        pyautogui.moveTo(x, end_y, duration=duration, _pause=False)
+        time.sleep(hold)
+        pyautogui.mouseUp(_pause=False)
+
+def press_escape():
+    """Tap the Escape key without pyautogui's pause"""
+    if sys.platform == 'win32':
+        user32.keybd_event(VK_ESCAPE, 0, 0, 0)
+        user32.keybd_event(VK_ESCAPE, 0, KEYEVENTF_KEYUP, 0)
+    else:
+        import pyautogui
+        pyautogui.press('escape')
@@ -1,26 +1,66 @@
+import threading
 import time
-import pyautogui
 import cv2
 import numpy as np
 import pygetwindow as gw
 
+# Optional: bettercam reads frames from DXGI Desktop Duplication on a
+# background thread, so capture() is a ring-buffer read instead of a GDI grab
+try:
+    import bettercam
+except ImportError:
+    bettercam = None
+
+# Optional: mss grabs straight into a BGRA buffer; used when bettercam isn't
+# running, instead of pyautogui's PIL screenshot + RGB->BGR round trip
+try:
+    import mss
+except ImportError:
+    mss = None
+
 # Target window size for consistent behavior
 TARGET_WINDOW_WIDTH = 1734
 TARGET_WINDOW_HEIGHT = 703
 
+# Frame rate the bettercam background thread captures at
+CAPTURE_TARGET_FPS = 30
+
 
 class WindowCapture:
     def __init__(self, window_title):
         self.window_title = window_title
         self.window_info = None
+        self._window = None         # pygetwindow Window of the game, see _find_window
+        self._cam = None            # bettercam camera, created on first capture
+        self._cam_region = None     # (left, top, right, bottom) the camera was started with
+        self._cam_failed = False    # bettercam unavailable for this window, use mss/pyautogui
+        self._sct_local = threading.local()  # One mss instance per capturing thread (see _grab)
 
-    def get_window(self):
-        """Find and activate the target window"""
-        window = None
+    def _find_window(self):
+        """
+        Get the game window, enumerating all window titles only the first time
+        (or again once the remembered window has closed)
+        
+        Returns:
+            pygetwindow Window, or None if no window title matches
+        """
+        if self._window is not None:
+            try:
+                # A closed window's handle no longer reports the game title
+                if self.window_title in self._window.title:
+                    return self._window
+            except Exception:
+                pass
+            self._window = None
         for w in gw.getAllTitles():
             if self.window_title in w:
-                window = gw.getWindowsWithTitle(w)[0]
+                self._window = gw.getWindowsWithTitle(w)[0]
                 break
+        return self._window
+
+    def get_window(self):
+        """Find and activate the target window"""
+        window = self._find_window()
         if not window:
             raise Exception(f'Window "{self.window_title}" not found.')
         window.activate()
@@ -44,11 +84,7 @@ class WindowCapture:
             'not_found' if window wasn't found
             'error' if resize failed
         """
-        window = None
-        for w in gw.getAllTitles():
-            if self.window_title in w:
-                window = gw.getWindowsWithTitle(w)[0]
-                break
+        window = self._find_window()
         
         if not window:
             return 'not_found'
@@ -69,11 +105,111 @@ class WindowCapture:
         except Exception:
             return 'error'
 
-    def capture(self):
-        """Capture screenshot of the window"""
+    def _get_camera(self):
+        """
+        Get a running bettercam camera for the current window rectangle.
+        Restarts the camera on the new region if the window moved or was resized.
+        
+        Returns:
+            The camera, or None if bettercam isn't available
+        """
+        if bettercam is None or self._cam_failed:
+            return None
+        left, top, width, height = self.window_info
+        region = (left, top, left + width, top + height)
+        if self._cam is not None and self._cam_region == region:
+            return self._cam
+        try:
+            cam = self._cam
+            if cam is None:
+                cam = bettercam.create(output_idx=0, output_color='BGR')
+            else:
+                # bettercam.create hands back the same per-output camera (still set to
+                # the old region), so restart this one with the new region instead
+                cam.stop()
+            cam.start(region=region, target_fps=CAPTURE_TARGET_FPS, video_mode=True)
+        except Exception:
+            # Window off the primary output, no DXGI, etc.
+            self.close()
+            self._cam_failed = True
+            return None
+        self._cam = cam
+        self._cam_region = region
+        return cam
+
+    def _grab(self, left, top, width, height, out=None):
+        """
+        Grab a screen rectangle without bettercam (mss if installed, else pyautogui)
+        
+        Args:
+            left, top, width, height: Screen rectangle
+            out: Optional BGR array of shape (height, width, 3) to write into
+        
+        Returns:
+            BGR frame (out itself when given)
+        """
+        if mss is not None:
+            # mss handles aren't shared across threads (the scanner captures from a worker)
+            sct = getattr(self._sct_local, 'sct', None)
+            if sct is None:
+                sct = self._sct_local.sct = mss.mss()
+            raw = sct.grab({'left': left, 'top': top, 'width': width, 'height': height})
+            bgra = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+            return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+        import pyautogui  # Last-resort grabber; kept out of the startup imports
+        screenshot = pyautogui.screenshot(region=(left, top, width, height))
+        return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR, dst=out)
+
+    def close(self):
+        """Stop the bettercam capture thread and release the camera (if one is running)"""
+        if self._cam is not None:
+            try:
+                self._cam.release()
+            except Exception:
+                pass
+            self._cam = None
+            self._cam_region = None
+
+    def capture(self, out=None):
+        """
+        Capture screenshot of the window
+        
+        Args:
+            out: Optional BGR array to write the frame into (reused when its
+                 shape matches the window, otherwise a new array is returned)
+        
+        Returns:
+            BGR frame (out itself when it was reused)
+        """
         if not self.window_info:
             self.get_window()
+        if out is not None and out.shape != (self.window_info[3], self.window_info[2], 3):
+            out = None
+        cam = self._get_camera()
+        if cam is not None:
+            frame = cam.get_latest_frame()
+            if frame is not None:
+                # Copy out of the ring buffer so callers can hold on to it
+                if out is not None and out.shape == frame.shape:
+                    np.copyto(out, frame)
+                    return out
+                return frame.copy()
         left, top, width, height = self.window_info
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-        return frame
+        return self._grab(left, top, width, height, out)
+
+    def capture_region(self, y, h):
+        """
+        Capture a horizontal band of the window (full width, rows y to y+h).
+        Much less to grab and convert than the whole window.
+        """
+        if not self.window_info:
+            self.get_window()
+        left, top, width, height = self.window_info
+        y = max(0, y)
+        h = max(1, min(h, height - y))
+        cam = self._get_camera()
+        if cam is not None:
+            frame = cam.get_latest_frame()
+            if frame is not None:
+                return frame[y:y + h].copy()
+        return self._grab(left, top + y, width, h)